@@ -1,45 +1,148 @@
 from agents.base_agent import BaseAgent
+import asyncio
+from typing import Dict, Iterator, List, Optional, Union
 
-class AcademicAdvisorAgent(BaseAgent):
-    """
-    模拟一位LLM-Agent领域的顶尖学术专家，专注于前沿理论创新与学术突破
-    """
-    def __init__(self):
-        # 为高校导师定义系统提示词，强化对创新性研究的指导能力
-        system_prompt = """
-        You are a methodical, experienced professor at an internationally renowned university, a respected expert in the LLM-Agent field known for rigorous, well-grounded research. You have served as Area Chair at multiple top conferences and are known for promoting solid, incremental advances rather than speculative leaps. You are currently advising a PhD student with strong potential in artificial intelligence.
+# 为高校导师定义系统提示词，强化对创新性研究的指导能力
+_SYSTEM_PROMPT = """
+You are a professor at an internationally renowned university and a respected LLM-Agent researcher who has served as Area Chair at multiple top conferences. You advise a promising AI PhD student.
+
+Expertise: Large Language Model Agents; your papers are cited for solid theory, reproducible results, and clear progression from prior work.
+
+Responsibilities:
+1. Help the student find well-defined, significant, appropriately scoped research questions
+2. Analyze limitations of existing approaches and develop logical improvements
+3. Give theoretical insight and practical methodological guidance
+4. Build rigorous research thinking and coherent research frameworks
 
-        Your research focus is Large Language Model Agents (LLM-Agents), and you are recognized for your thorough understanding of the field's foundations and methodical approach to innovation. Your papers are frequently cited for their solid theoretical grounding, reproducible results, and clear progression from existing work.
+Style: methodical, evidence-based, reproducible; critical but constructive; prefers incremental advances with clear paths over speculative leaps; expects claims proportional to evidence.
 
-        As a thoughtful academic advisor, your core responsibilities are:
-        1. Guide the PhD student to identify well-defined, addressable research questions with clear significance
-        2. Help the student systematically analyze limitations of existing approaches and develop logical improvements
-        3. Provide methodical theoretical insights and practical methodological guidance
-        4. Cultivate rigorous, systematic research thinking that builds incrementally on established foundations
-        5. Help the student develop coherent research frameworks with appropriate scope
+Goal: help the student complete a solid paper with meaningful contributions to top conferences or journals.
 
-        Your academic characteristics:
-        - Strong methodical approach that emphasizes thorough understanding before innovation
-        - Critical thinking that identifies specific, addressable limitations in current approaches
-        - Practical insights into research implementation, emphasizing feasibility and reproducibility
-        - High standards for evidence-based claims and appropriate scope of contributions
-        - Encouraging careful, well-reasoned innovation while maintaining academic rigor
+IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
+"""
 
-        When guiding the PhD student, you should:
-        - Promote systematic thinking that builds logically on established work
-        - Offer constructive criticism that helps refine and focus research ideas
-        - Share practical insights about promising research directions with solid foundations
-        - Guide the student to identify specific, well-defined problems with clear paths to solution
-        - Encourage innovations that represent logical next steps rather than speculative leaps
+# 各方法提示词中不变的前导和结尾部分，只在模块加载时构建一次，保证每次请求的这部分内容完全一致
+_REVIEW_PLAN_PREAMBLE = """
+Review the following research plan and give balanced, constructive feedback focused on logical progression and feasible improvements:
 
-        Your goal is to help the PhD student complete a solid, well-grounded paper that makes meaningful contributions to top conferences or journals through careful, methodical research rather than speculative claims.
+"""
+_REVIEW_PLAN_TRAILER = """
+
+Evaluate:
+1. Research question: well-defined and appropriately scoped?
+2. Theoretical framework: builds coherently on established work?
+3. Methods: appropriate for the problem and feasible to implement?
+4. Expected contributions: proportional to the likely evidence?
+5. Literature: shows thorough understanding of prior work?
 
-        IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
-        """
+Then:
+- Flag scope to narrow, unsupported assumptions, and methodological details needing development
+- Suggest logical extensions of existing approaches, adaptable theoretical frameworks, and natural next-step directions
+
+Give specific, practical feedback that turns the plan into a feasible, step-by-step project with meaningful contributions.
+"""
+
+_REVIEW_DRAFT_PREAMBLE = """
+Conduct a rigorous top-conference review of the following paper draft:
+
+"""
+_REVIEW_DRAFT_TRAILER = """
+
+Evaluate:
+1. Originality of theoretical contributions
+2. Significance and difficulty of the research question
+3. Methodological innovation
+4. Rigor and persuasiveness of the experiments
+5. Connection to cutting-edge (even unpublished) research trends
+6. Depth of theoretical analysis, including limitations
+7. Novelty of the research perspective
+
+Then:
+- Identify parts lacking innovation and how to raise originality
+- Challenge weak methods or conclusions; raise objections and alternative explanations
+- Suggest concrete revisions that strengthen theory, methodology, and experiments
+
+Be strict, sharp but fair, and constructive, aiming for top-conference impact.
+"""
+
+# 按评审维度拆分的论文审核：各维度独立并发请求，每个请求只生成一个维度的较短评审。
+# 论文草稿放在提示词前部，使各维度请求共享相同的前缀
+_DRAFT_ASPECTS = (
+    ("原创性", "Originality of theoretical contributions; identify parts lacking innovation and how to raise originality"),
+    ("研究问题", "Significance and difficulty of the research question"),
+    ("方法创新", "Methodological innovation; challenge weak methods and suggest stronger alternatives"),
+    ("实验", "Rigor and persuasiveness of the experiments; raise objections and alternative explanations"),
+    ("前沿关联", "Connection to cutting-edge (even unpublished) research trends"),
+    ("理论深度", "Depth of theoretical analysis, including limitations"),
+    ("研究视角", "Novelty of the research perspective"),
+)
+_DRAFT_ASPECT_TRAILER = """
+
+Review ONLY this aspect of the draft above: {aspect}.
+Be strict, sharp but fair, and give concrete revisions aimed at top-conference impact. Keep it focused and concise.
+"""
+
+_SUGGEST_DIRECTIONS_PROMPT = """
+Propose promising LLM-Agent research directions that are logical next steps with addressable challenges, covering:
+
+1. Theory: specific limitations of current frameworks, extensions of existing theories, well-defined open questions
+2. Methods: practically important technical challenges, incremental but significant enhancements, integration of complementary methods
+3. Applications: emerging areas with demonstrable value, focused applied challenges, scoped academia-industry collaboration
+4. Interdisciplinary: established links to other AI fields, adaptable techniques from related disciplines, well-defined cross-domain problems
+
+For each direction give its academic and practical significance, how it builds on existing work, a step-by-step investigation plan, and realistic expected outcomes.
 
+Favor achievable advances reachable through systematic work over speculative or impractical ideas.
+"""
+
+_THEORETICAL_INSIGHT_PREAMBLE = """
+Provide deep theoretical insights on the following research topic:
+
+Research topic: """
+_THEORETICAL_INSIGHT_TRAILER = """
+
+Analyze:
+1. Foundations: core constructs, strengths and limits of existing frameworks, key milestones
+2. Essence: core challenges, theoretical sources of difficulty, potential breakthrough points
+3. Formalization: mathematical representation, theoretical boundaries and complexity, possible guarantees or impossibility results
+4. Innovation opportunities: gaps or contradictions in existing theory, directions for unification or reconstruction, new perspectives
+
+Go beyond published results with forward-looking understanding; be rigorous yet accessible, with practical research inspiration.
+"""
+
+_ANSWER_QUESTION_PREAMBLE = """
+Answer the following question from the PhD student with cutting-edge vision and theoretical depth:
+
+"""
+_ANSWER_QUESTION_TRAILER = """
+
+Give deep insight into the question, share cutting-edge (including not-yet-mainstream) perspectives, point out the deeper research opportunities it implies, challenge conventional thinking, and steer the student toward directions with significant academic impact.
+"""
+
+# full_review将三个任务合并为一次请求，要求模型以JSON对象返回各任务的结果
+_FULL_REVIEW_KEYS = ("plan_review", "directions", "theory_insight")
+_FULL_REVIEW_HEADER = """
+Complete the three tasks below in a single response.
+
+Task 1 (plan_review):"""
+_FULL_REVIEW_DIRECTIONS = """
+Task 2 (directions):"""
+_FULL_REVIEW_THEORY = """
+Task 3 (theory_insight):"""
+_FULL_REVIEW_FOOTER = """
+Return JSON with keys "plan_review", "directions", "theory_insight"; each value is the complete answer to that task as a Markdown string written in Simplified Chinese.
+"""
+
+
+class AcademicAdvisorAgent(BaseAgent):
+    """
+    模拟一位LLM-Agent领域的顶尖学术专家，专注于前沿理论创新与学术突破
+    """
+    def __init__(self, memory_dir: Optional[str] = None):
         super().__init__(
             role="高校导师",
-            system_prompt=system_prompt
+            system_prompt=_SYSTEM_PROMPT,
+            memory_dir=memory_dir
         )
 
     def review_research_plan(self, research_plan: str) -> str:
@@ -52,31 +155,11 @@ class AcademicAdvisorAgent(BaseAgent):
         Returns:
             对研究计划的评价和建议
         """
-        prompt = f"""
-        As a methodical scholar in the LLM-Agent field, please review the following research plan and provide balanced, constructive feedback focused on logical progression and feasible improvements:
-
-        {research_plan}
+        return self.get_response(_REVIEW_PLAN_PREAMBLE + research_plan + _REVIEW_PLAN_TRAILER, temperature=0.7)
 
-        Please evaluate from the following aspects:
-        1. Clarity and specificity of the research question - Is this a well-defined problem with appropriate scope?
-        2. Logical foundation of the theoretical framework - How does it build on established work in a coherent manner?
-        3. Methodological soundness - Are the proposed methods appropriate for the stated problems and feasible to implement?
-        4. Appropriateness of expected contributions - Are the claims proportional to the evidence likely to be generated?
-        5. Connection to existing literature - Does it demonstrate thorough understanding of relevant prior work?
-
-        Specifically address practical considerations in this plan:
-        - Identify areas where the scope may need to be narrowed for feasibility
-        - Question assumptions that may not be fully supported by existing evidence
-        - Suggest specific methodological details that need further development
-
-        Also provide constructive improvement directions:
-        - Recommend logical extensions of existing approaches that address specific limitations
-        - Suggest established theoretical frameworks that could be adapted to this context
-        - Share focused research directions that represent natural next steps in the field
-
-        Please provide specific, practical feedback aimed at refining the research plan into a feasible project with meaningful contributions. Focus on helping the student develop a coherent, step-by-step approach rather than encouraging speculative leaps. Your suggestions should represent logical progressions from established work rather than revolutionary but impractical ideas.
-        """
-        return self.get_response(prompt, temperature=0.7)
+    async def areview_research_plan(self, research_plan: str) -> str:
+        """审核研究计划，提供创新性指导（异步版本）"""
+        return await self.aget_response(_REVIEW_PLAN_PREAMBLE + research_plan + _REVIEW_PLAN_TRAILER, temperature=0.7)
 
     def review_paper_draft(self, paper_draft: str) -> str:
         """
@@ -88,34 +171,34 @@ class AcademicAdvisorAgent(BaseAgent):
         Returns:
             对论文草稿的学术评价和修改建议
         """
-        prompt = f"""
-        As a top scholar in the LLM-Agent field, please conduct a rigorous academic review of the following paper draft, pushing it to reach the innovative level of top conferences:
+        return self.get_response(_REVIEW_DRAFT_PREAMBLE + paper_draft + _REVIEW_DRAFT_TRAILER, temperature=0.7)
 
-        {paper_draft}
+    async def areview_paper_draft(self, paper_draft: str) -> str:
+        """审核论文草稿，推动理论创新和学术突破（异步版本）"""
+        return await self.aget_response(_REVIEW_DRAFT_PREAMBLE + paper_draft + _REVIEW_DRAFT_TRAILER, temperature=0.7)
 
-        Please provide in-depth evaluation from the following aspects:
-        1. Originality of theoretical contributions - To what extent does this work break through existing knowledge boundaries?
-        2. Academic value of the research question - Is this a fundamental and challenging problem in the field?
-        3. Innovation level of methodology - Does the proposed method represent a conceptual breakthrough?
-        4. Rigor and persuasiveness of experimental design - Are the experiments sufficient to prove the superiority of the method?
-        5. Connection with cutting-edge research - How does the work connect with the latest (even unpublished) research trends?
-        6. Theoretical depth of the paper - Is the analysis of the theoretical foundation and limitations of the proposed method sufficient?
-        7. Uniqueness of research perspective - Does it re-examine the problem from a new angle?
+    async def areview_paper_draft_by_aspect(self, paper_draft: str) -> str:
+        """
+        按评审维度拆分审核论文草稿，各维度并发请求后合并结果（异步版本）
 
-        Targeted challenges:
-        - Identify parts of the paper lacking innovation and provide specific suggestions to enhance originality
-        - Question weak points in methods or conclusions, pushing for more rigorous argumentation
-        - Raise possible objections and alternative explanations, promoting more comprehensive discussion
+        与areview_paper_draft相比，总耗时取决于最长的单个维度评审而不是全部维度之和，
+        对话历史中仍只记录一轮完整的审核问答
 
-        Specific improvement suggestions:
-        - Point out modification directions that can significantly enhance the paper's theoretical contributions
-        - Suggest key points for deepening theoretical analysis
-        - Recommend specific ways to strengthen methodological innovation
-        - Propose improvements to enhance the persuasiveness of experiments
+        Args:
+            paper_draft: 博士生提交的论文草稿
 
-        Please provide strict, in-depth, and constructive evaluation, with the goal of elevating this paper to a level that can have significant impact at top conferences. The review should be sharp but fair, challenging but constructive.
+        Returns:
+            按维度分节的学术评价和修改建议
         """
-        return self.get_response(prompt, temperature=0.7)
+        prefix = _REVIEW_DRAFT_PREAMBLE + paper_draft
+        results = await asyncio.gather(*[
+            self.aget_response(prefix + _DRAFT_ASPECT_TRAILER.format(aspect=desc), temperature=0.7, record_history=False)
+            for _, desc in _DRAFT_ASPECTS
+        ])
+        review = "\n\n".join(f"## {name}\n{result}" for (name, _), result in zip(_DRAFT_ASPECTS, results))
+
+        self._record_exchange(prefix + _REVIEW_DRAFT_TRAILER, review)
+        return review
 
     def suggest_research_directions(self) -> str:
         """
@@ -124,40 +207,11 @@ class AcademicAdvisorAgent(BaseAgent):
         Returns:
             前沿研究方向和机会
         """
-        prompt = """
-        As a methodical scholar in the LLM-Agent field, please share your insights on promising research directions that represent logical next steps and addressable challenges in the field.
-
-        Please propose well-grounded suggestions from the following dimensions:
-
-        1. Theoretical Refinement Opportunities:
-           - Specific limitations in current LLM-Agent theoretical frameworks that need addressing
-           - Extensions of existing theories that could yield meaningful improvements
-           - Well-defined research questions with clear paths to investigation
-
-        2. Methodological Improvement Areas:
-           - Specific technical challenges in existing Agent methods with practical importance
-           - Incremental but significant enhancements to current methodological approaches
-           - Opportunities for systematic integration of complementary methods
+        return self.get_response(_SUGGEST_DIRECTIONS_PROMPT, temperature=0.8)
 
-        3. Practical Application Developments:
-           - Emerging application areas where LLM-Agents could provide demonstrable value
-           - Specific technical challenges in applied settings that require focused solutions
-           - Collaborative opportunities between academia and industry with defined scope
-
-        4. Focused Interdisciplinary Connections:
-           - Established connections with other AI fields that could be further developed
-           - Specific techniques from related disciplines that could be adapted systematically
-           - Well-defined problems that benefit from targeted interdisciplinary approaches
-
-        For each proposed research direction:
-        - Clarify its specific academic and practical significance
-        - Explain how it builds logically on existing research
-        - Outline a step-by-step approach to investigating this direction
-        - Describe realistic expected outcomes and their value to the field
-
-        Please focus on research directions that represent meaningful, achievable advances rather than speculative leaps. Your suggestions should help the PhD student identify focused, well-defined research questions that can lead to solid contributions through methodical work. Emphasize directions where clear progress can be made through systematic investigation rather than revolutionary but impractical ideas.
-        """
-        return self.get_response(prompt, temperature=0.8)
+    async def asuggest_research_directions(self) -> str:
+        """提供前沿研究方向建议（异步版本）"""
+        return await self.aget_response(_SUGGEST_DIRECTIONS_PROMPT, temperature=0.8)
 
     def provide_theoretical_insight(self, topic: str) -> str:
         """
@@ -169,60 +223,114 @@ class AcademicAdvisorAgent(BaseAgent):
         Returns:
             理论洞察和分析
         """
-        prompt = f"""
-        As a theoretical expert in the LLM-Agent field, please provide deep theoretical insights on the following research topic:
+        return self.get_response(_THEORETICAL_INSIGHT_PREAMBLE + topic + _THEORETICAL_INSIGHT_TRAILER, temperature=0.6)
 
-        Research topic: {topic}
+    async def aprovide_theoretical_insight(self, topic: str) -> str:
+        """提供深度理论洞察（异步版本）"""
+        return await self.aget_response(_THEORETICAL_INSIGHT_PREAMBLE + topic + _THEORETICAL_INSIGHT_TRAILER, temperature=0.6)
 
-        Please analyze from the following perspectives:
-
-        1. Theoretical Foundation:
-           - Core theoretical constructs of this topic
-           - Advantages and limitations of existing theoretical frameworks
-           - Key milestones and evolutionary trajectory of theoretical development
-
-        2. Essential Analysis:
-           - Essential characteristics and core challenges of the problem
-           - Theoretical sources of problem difficulty
-           - Potential theoretical breakthrough points
-
-        3. Formal Analysis:
-           - Mathematical or formal representation of the problem
-           - Theoretical boundaries and complexity analysis
-           - Possible theoretical guarantees or impossibility results
+    def answer_question(self, question: str, stream: bool = False) -> Union[str, Iterator[str]]:
+        """
+        回答博士生的学术问题，提供前沿且有深度的指导
 
-        4. Theoretical Innovation Opportunities:
-           - Important gaps or contradictions in existing theories
-           - Possible directions for theoretical unification or reconstruction
-           - New theoretical perspectives worth exploring
+        Args:
+            question: 博士生提出的问题
+            stream: 是否以流式方式返回回答
 
-        Please provide deep, rigorous, and insightful theoretical analysis, not limited to published research results, but also including your forward-looking understanding of the field. The analysis should be profound yet accessible, with both theoretical depth and practical research inspiration.
+        Returns:
+            学术指导回答，stream为True时为回答片段的迭代器
         """
-        return self.get_response(prompt, temperature=0.6)
-
-    def answer_question(self, question: str) -> str:
+        if stream:
+            return self._stream_answer_question(question)
+
+        response = self.get_response(_ANSWER_QUESTION_PREAMBLE + question + _ANSWER_QUESTION_TRAILER, temperature=0.7)
+        return f"[高校导师回复] {response}"
+
+    def _stream_answer_question(self, question: str) -> Iterator[str]:
+        """流式回答问题，回复标签随第一个片段立即产出"""
+        tagged = False
+        for chunk in self.stream_response(_ANSWER_QUESTION_PREAMBLE + question + _ANSWER_QUESTION_TRAILER, temperature=0.7):
+            if not tagged:
+                tagged = True
+                yield f"[高校导师回复] {chunk}"
+            else:
+                yield chunk
+
+    async def aanswer_question(self, question: str) -> str:
+        """回答博士生的学术问题，提供前沿且有深度的指导（异步版本）"""
+        response = await self.aget_response(_ANSWER_QUESTION_PREAMBLE + question + _ANSWER_QUESTION_TRAILER, temperature=0.7)
+        return f"[高校导师回复] {response}"
+
+    def answer_questions(self, questions: List[str]) -> List[str]:
         """
-        回答博士生的学术问题，提供前沿且有深度的指导
+        在一次请求中回答博士生的多个互不依赖的问题
 
         Args:
-            question: 博士生提出的问题
+            questions: 博士生提出的问题列表
 
         Returns:
-            学术指导回答
+            与问题顺序一致、带回复标签的回答列表
         """
-        prompt = f"""
-        As a top scholar in the LLM-Agent field, please answer the following question from the PhD student, providing guidance with cutting-edge vision and theoretical depth:
+        answers = self._answer_batched(_ANSWER_QUESTION_PREAMBLE, questions, _ANSWER_QUESTION_TRAILER)
+        return [f"[高校导师回复] {answer}" for answer in answers]
 
-        {question}
+    async def aanswer_questions(self, questions: List[str]) -> List[str]:
+        """在一次请求中回答博士生的多个互不依赖的问题（异步版本）"""
+        answers = await self._aanswer_batched(_ANSWER_QUESTION_PREAMBLE, questions, _ANSWER_QUESTION_TRAILER)
+        return [f"[高校导师回复] {answer}" for answer in answers]
 
-        Your answer should:
-        - Provide deep understanding and insights into the question
-        - Share cutting-edge research perspectives, including innovative viewpoints not yet widely accepted
-        - Point out deeper research opportunities implied in the question
-        - Challenge conventional thinking and propose innovative angles of thought
-        - Guide the PhD student to think about directions that can truly advance the field
+    def full_review(self, research_plan: str, topic: str) -> Dict[str, str]:
+        """
+        一次请求同时完成研究计划审核、研究方向建议和理论洞察，
+        需要两项及以上结果时比分别调用三个方法少两次往返和两次前缀计算
 
-        Don't just stay at the level of published research, but provide forward-looking perspectives that can inspire original thinking. Your goal is to stimulate the PhD student to think about research questions and methods that can have significant academic impact.
+        合并请求的回复被截断或无法解析时，改为分别调用三个单项方法
+
+        Args:
+            research_plan: 博士生提交的研究计划
+            topic: 需要理论洞察的研究主题
+
+        Returns:
+            包含plan_review、directions、theory_insight三个键的字典
         """
-        response = self.get_response(prompt, temperature=0.7)
-        return f"[高校导师回复] {response}"
\ No newline at end of file
+        result = self._get_combined_response(
+            self._full_review_prompt(research_plan, topic),
+            lambda reply: self._parse_json_fields(reply, _FULL_REVIEW_KEYS),
+            temperature=0.7
+        )
+        if result is None:
+            result = {
+                "plan_review": self.review_research_plan(research_plan),
+                "directions": self.suggest_research_directions(),
+                "theory_insight": self.provide_theoretical_insight(topic),
+            }
+        return result
+
+    async def afull_review(self, research_plan: str, topic: str) -> Dict[str, str]:
+        """一次请求同时完成研究计划审核、研究方向建议和理论洞察，失败时改为并发调用三个单项方法（异步版本）"""
+        result = await self._aget_combined_response(
+            self._full_review_prompt(research_plan, topic),
+            lambda reply: self._parse_json_fields(reply, _FULL_REVIEW_KEYS),
+            temperature=0.7
+        )
+        if result is None:
+            plan_review, directions, theory_insight = await asyncio.gather(
+                self.areview_research_plan(research_plan),
+                self.asuggest_research_directions(),
+                self.aprovide_theoretical_insight(topic)
+            )
+            result = {"plan_review": plan_review, "directions": directions, "theory_insight": theory_insight}
+        return result
+
+    @staticmethod
+    def _full_review_prompt(research_plan: str, topic: str) -> str:
+        """拼接full_review使用的提示词，复用三个单项任务的模板"""
+        return "".join([
+            _FULL_REVIEW_HEADER,
+            _REVIEW_PLAN_PREAMBLE, research_plan, _REVIEW_PLAN_TRAILER,
+            _FULL_REVIEW_DIRECTIONS,
+            _SUGGEST_DIRECTIONS_PROMPT,
+            _FULL_REVIEW_THEORY,
+            _THEORETICAL_INSIGHT_PREAMBLE, topic, _THEORETICAL_INSIGHT_TRAILER,
+            _FULL_REVIEW_FOOTER,
+        ])
\ No newline at end of file
@@ -1,17 +1,230 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, InternalServerError, NotFoundError
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import re
+import threading
+import time
+import unicodedata
 import datetime
-from typing import List, Dict, Any, Optional
+import functools
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Awaitable, Union, ClassVar, Tuple, Callable, TypeVar
+
+from agents import batch_api
+
+try:
+    import tiktoken
+except ImportError:  # 未安装tiktoken时退回到按字符数估算
+    tiktoken = None
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """
+    懒加载tiktoken编码器，加载失败（如未安装或无法下载编码文件）时返回None
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = None
+    return _encoding
+
+
+logger = logging.getLogger(__name__)
+
+# 连续相同角色的消息合并为一条时使用的分隔符
+_MERGE_SEPARATOR = "\n\n"
+
+# 所有Agent和模块共享的API客户端，共用同一个连接池以复用TCP/TLS连接
+_shared_client: Optional[OpenAI] = None
+_shared_async_client: Optional[AsyncOpenAI] = None
+_shared_async_client_loop: Optional[asyncio.AbstractEventLoop] = None  # 异步客户端所属的事件循环
+_client_lock = threading.Lock()
+
+
+def get_shared_client() -> OpenAI:
+    """
+    获取进程内共享的同步客户端，首次调用时创建（线程安全）
+
+    Returns:
+        共享的OpenAI客户端
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                _shared_client = OpenAI(
+                    api_key=os.environ.get("DEEPSEEK_API_KEY"),
+                    base_url="https://api.deepseek.com"
+                )
+    return _shared_client
+
+
+def get_shared_async_client() -> AsyncOpenAI:
+    """
+    获取当前事件循环内共享的异步客户端，首次调用时创建（线程安全）
+
+    异步客户端的连接池绑定创建它的事件循环，每次asyncio.run都会启动新的事件循环，
+    因此事件循环变化后重新创建客户端，而不是复用已关闭循环中的连接
+
+    Returns:
+        共享的AsyncOpenAI客户端
+    """
+    global _shared_async_client, _shared_async_client_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _shared_async_client is None or (loop is not None and _shared_async_client_loop is not loop):
+        with _client_lock:
+            if _shared_async_client is None or (loop is not None and _shared_async_client_loop is not loop):
+                _shared_async_client = AsyncOpenAI(
+                    api_key=os.environ.get("DEEPSEEK_API_KEY"),
+                    base_url="https://api.deepseek.com"
+                )
+                _shared_async_client_loop = loop
+    return _shared_async_client
+
+
+async def aclose_shared_async_client() -> None:
+    """
+    关闭当前事件循环内共享的异步客户端，释放其连接池；下次获取时重新创建
+
+    必须在创建该客户端的事件循环关闭之前调用
+    """
+    global _shared_async_client, _shared_async_client_loop
+    with _client_lock:
+        client = _shared_async_client
+        if client is None or _shared_async_client_loop not in (None, asyncio.get_running_loop()):
+            return
+        _shared_async_client = None
+        _shared_async_client_loop = None
+    await client.close()
+
+
+_T = TypeVar("_T")
+
+
+def run_async(coro: Awaitable[_T]) -> _T:
+    """
+    在新的事件循环中运行协程，事件循环关闭前关闭其中创建的共享异步客户端
+
+    供没有常驻事件循环的同步入口使用，避免每次asyncio.run都遗留一个未关闭的连接池
+
+    Args:
+        coro: 要运行的协程
+
+    Returns:
+        协程的返回值
+    """
+    async def run_and_close() -> _T:
+        try:
+            return await coro
+        finally:
+            await aclose_shared_async_client()
+    return asyncio.run(run_and_close())
+
+
+def iso_timestamp(memory: Dict[str, Any]) -> str:
+    """
+    返回记忆的ISO格式创建时间
+
+    记忆写入时只保存整数纳秒时间戳（ts），需要展示或导出时再转换；
+    兼容旧版直接保存ISO字符串（timestamp）的记忆
+
+    Args:
+        memory: 记忆条目
+
+    Returns:
+        ISO格式的时间字符串
+    """
+    ts = memory.get("ts")
+    if ts is None:
+        return memory.get("timestamp", "")
+    return datetime.datetime.fromtimestamp(ts / 1e9).isoformat()
+
+
+# 计算响应缓存键时忽略的空白差异
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_for_cache(text: str) -> str:
+    """
+    将文本规范化后用于计算缓存键：统一全角/半角字符、合并空白、忽略大小写，
+    只有排版差异（多余空行、缩进、全角标点等）的请求会得到相同的键
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+# 多个问题合并为一次请求时的提示词，要求模型以JSON数组按顺序返回各问题的回答
+_BATCHED_QUESTIONS_HEADER = """
+The PhD student has {count} separate questions. Answer each question on its own, following the same instructions for every question.
+"""
+_BATCHED_QUESTIONS_FOOTER = """
+Return JSON with the key "answers" whose value is an array of {count} strings in question order; each string is the complete answer to that question as Markdown written in Simplified Chinese.
+"""
+
+# 可以通过退避重试恢复的临时性错误（限流、网络问题、服务端错误；APITimeoutError是APIConnectionError的子类）
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+class DeepSeekAPIError(Exception):
+    """API调用在重试后仍然失败时抛出，原始异常保存在__cause__中"""
+
 
 class BaseAgent:
     """
     所有Agent的基类，提供基本的对话和记忆功能
     """
+    # 所有Agent共享的最大并发API请求数，避免触发DeepSeek的速率限制
+    MAX_CONCURRENT_REQUESTS = 8
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # 临时性错误的指数退避重试参数
+    MAX_RETRIES = 5
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 30.0
+
+    # 裁剪掉的对话在后台压缩进滚动摘要，摘要作为第二条系统消息随请求发送
+    COMPACT_EVICTED_HISTORY = True
+    _compaction_executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+
+    # 长期记忆条数上限：超过后将最早的一批记忆压缩为一条归档总结，
+    # 归档总结本身也会在之后被再次归档（总结的总结），因此记忆条数始终有界
+    MAX_MEMORIES = 50
+    MEMORY_ARCHIVE_BATCH = 20
+    ARCHIVE_PHASE = "archived"
+
+    # 多项任务合并为一次JSON请求时的输出token上限（deepseek-chat允许的最大值）；
+    # 回复仍被截断或无法解析时，调用方改为逐项请求
+    COMBINED_REPLY_MAX_TOKENS = 8192
+
+    # 响应缓存：相同模型、温度和消息序列的请求直接复用之前的回复（按LRU淘汰）
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_MAX_TEMPERATURE = 0.8  # 温度高于此值的请求本身追求随机性，不缓存
+    RESPONSE_CACHE_TTL = 3600.0  # 缓存条目的有效期（秒），超时后重新请求
+    _response_cache: ClassVar["OrderedDict[bytes, Tuple[float, str]]"] = OrderedDict()
+    _response_cache_hits: ClassVar[int] = 0
+    _response_cache_lookups: ClassVar[int] = 0
+
     def __init__(
         self,
         role: str,
         system_prompt: str,
-        model: str = "deepseek-chat"
+        model: str = "deepseek-chat",
+        memory_dir: Optional[str] = None,
+        system_prompt_tokens: Optional[int] = None
     ):
         """
         初始化Agent
@@ -20,20 +233,155 @@ class BaseAgent:
             role: Agent的角色名称
             system_prompt: 系统提示词，定义Agent的行为和知识
             model: 使用的模型名称
+            memory_dir: 可选的长期记忆持久化目录，指定后记忆以JSONL格式逐条追加到
+                "{memory_dir}/{role}.jsonl"，并在初始化时加载已有记忆，进程重启后无需重新总结
+            system_prompt_tokens: 可选的系统提示词token数，未提供时在首次请求前按提示词内容计算并在进程内缓存，
+                同一角色的多个Agent实例不会重复分词
         """
         self.role = role
         self.system_prompt = system_prompt
         self.model = model
-        self.client = OpenAI(
-            api_key=os.environ.get("DEEPSEEK_API_KEY"),
-            base_url="https://api.deepseek.com"
-        )
-        self.conversation_history = []
-        self.memory_bank = []  # 长期记忆存储
+        # 客户端在首次请求时才创建，构造未被使用的Agent不会触发任何客户端初始化
+        self._client: Optional[OpenAI] = None
+        self._aclient: Optional[AsyncOpenAI] = None
+        self.memory_bank = []  # 长期记忆存储（按时间顺序，保存和持久化都使用这个列表）
+        self._memories_by_phase: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # 按阶段索引的同一批记忆
+        self._memory_path = Path(memory_dir) / f"{role}.jsonl" if memory_dir else None
+        self._load_memories()
+        self._memory_context: Optional[str] = None  # 注入到用户消息前的记忆内容
+        self._memory_version = 0  # 每次新增记忆时递增，用于判断已注入的记忆内容是否过期
+        self._memory_context_key: Optional[tuple] = None  # 生成当前记忆内容时的(阶段, 记忆版本)
+
+        # 系统消息创建后不再修改，作为每次请求的固定前缀
+        self._system_message = {"role": "system", "content": system_prompt} if system_prompt else None
+
+        # 对话历史按系统消息和对话消息分开存储，并增量维护token估计，
+        # 裁剪时只需从对话消息队列头部弹出，无需每次重新扫描整个历史。
+        # 对话消息以角色、内容、token数三个并列队列保存（而不是每条消息一个字典），
+        # 只在发送请求时才组装成API需要的字典列表
+        self._system_msgs: List[Dict[str, str]] = []
+        self._system_msg_tokens: List[int] = []  # 每条系统消息的token数，与_system_msgs一一对应
+        self._system_tokens = 0
+        self._chat_roles: deque = deque()
+        self._chat_contents: deque = deque()
+        self._chat_tokens: deque = deque()
+        self._total_tokens = 0
+
+        # 被裁剪的对话消息的滚动摘要，由后台线程更新
+        self._running_summary: Optional[str] = None
+        self._running_summary_tokens = 0
+        self._evicted_messages: List[Dict[str, str]] = []  # 等待压缩的消息
+        self._evicted_lock = threading.Lock()  # 保护等待压缩的消息列表
+        self._compaction_lock = threading.Lock()  # 同一Agent的压缩任务串行执行
+        self._summary_generation = 0  # 清除历史时递增，丢弃清除之前启动的压缩结果
+
+        # 添加系统提示到对话历史。未提供token数时先记为0，首次请求前再计算：
+        # 加载tiktoken编码器可能需要联网下载编码文件，构造Agent本身不应因此阻塞或在离线时失败
+        self._system_prompt_tokens_pending = False
+        if self._system_message:
+            self._system_prompt_tokens_pending = system_prompt_tokens is None
+            self._append_message("system", system_prompt, system_prompt_tokens or 0)
+
+    @property
+    def client(self) -> OpenAI:
+        """同步客户端，首次访问时获取共享客户端"""
+        if self._client is None:
+            self._client = get_shared_client()
+        return self._client
+
+    @client.setter
+    def client(self, value: OpenAI) -> None:
+        self._client = value
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """异步客户端，未显式指定时使用当前事件循环的共享客户端"""
+        if self._aclient is None:
+            return get_shared_async_client()
+        return self._aclient
+
+    @aclient.setter
+    def aclient(self, value: AsyncOpenAI) -> None:
+        self._aclient = value
+
+    @staticmethod
+    def _estimate_tokens(content: str) -> int:
+        """
+        估算一段文本的token数量
+
+        优先使用tiktoken的cl100k_base编码计数；不可用时退回保守估计：每2个字符1个token
+        （英文约为每4个字符1个token，中文约为每1.5个字符1个token）。
+        每条消息只在加入历史时计算一次，之后复用缓存的结果
+        """
+        encoding = _get_encoding()
+        if encoding is None:
+            return len(content) >> 1
+        return len(encoding.encode(content, disallowed_special=()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _estimate_static_tokens(content: str) -> int:
+        """固定文本（如系统提示词、已生成的记忆）的token数，按内容缓存，同一文本在进程内只分词一次"""
+        return BaseAgent._estimate_tokens(content)
+
+    def _append_message(self, role: str, content: str, tokens: Optional[int] = None) -> None:
+        """
+        将一条消息追加到对话历史，并同步更新token统计
 
-        # 添加系统提示到对话历史
-        if system_prompt:
-            self.conversation_history.append({"role": "system", "content": system_prompt})
+        与上一条对话消息角色相同时直接合并到上一条消息中，保证历史中的角色始终交替
+
+        Args:
+            role: 消息的角色 (system, user, assistant)
+            content: 消息内容
+            tokens: 可选的预先计算的token数
+        """
+        if tokens is None:
+            tokens = self._estimate_tokens(content)
+        if role == "system":
+            self._system_msgs.append({"role": role, "content": content})
+            self._system_msg_tokens.append(tokens)
+            self._system_tokens += tokens
+        elif self._chat_roles and self._chat_roles[-1] == role:
+            self._chat_contents[-1] += _MERGE_SEPARATOR + content
+            self._chat_tokens[-1] += tokens
+        else:
+            self._chat_roles.append(role)
+            self._chat_contents.append(content)
+            self._chat_tokens.append(tokens)
+        self._total_tokens += tokens
+
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """对话历史（系统消息在前，其后是按时间顺序排列的对话消息）"""
+        return self._system_msgs + [
+            {"role": role, "content": content}
+            for role, content in zip(self._chat_roles, self._chat_contents)
+        ]
+
+    @conversation_history.setter
+    def conversation_history(self, messages: List[Dict[str, str]]) -> None:
+        self._system_prompt_tokens_pending = False
+        self._system_msgs = []
+        self._system_msg_tokens = []
+        self._system_tokens = 0
+        self._chat_roles = deque()
+        self._chat_contents = deque()
+        self._chat_tokens = deque()
+        self._total_tokens = 0
+        for msg in messages:
+            # 系统消息通常是固定的提示词，复用缓存的token数
+            tokens = self._estimate_static_tokens(msg["content"]) if msg["role"] == "system" else None
+            self._append_message(msg["role"], msg["content"], tokens)
+
+    def _resolve_system_prompt_tokens(self) -> None:
+        """计算构造时推迟的系统提示词token数（编码器不可用时退回按字符数估计），并计入token统计"""
+        if not self._system_prompt_tokens_pending:
+            return
+        self._system_prompt_tokens_pending = False
+        tokens = self._estimate_static_tokens(self.system_prompt)
+        self._system_msg_tokens[0] += tokens
+        self._system_tokens += tokens
+        self._total_tokens += tokens
 
     def manage_history_length(self, max_tokens: int = 40000) -> None:
         """
@@ -42,202 +390,895 @@ class BaseAgent:
         Args:
             max_tokens: 最大允许的token数量，默认设置为40000以留出足够的安全余量
         """
-        # 更精确地估算token数量
-        # 英文约为每4个字符1个token，中文约为每1.5个字符1个token
-        # 这里采用保守估计：每2个字符1个token
-        estimated_tokens = sum(len(msg["content"]) // 2 for msg in self.conversation_history)
+        self._resolve_system_prompt_tokens()
+
+        # 如果估算的token数量没有超过限制，无需裁剪
+        if self._total_tokens <= max_tokens:
+            return
+
+        # 如果系统消息已经超过限制，则需要裁剪系统消息
+        if self._system_tokens > max_tokens * 0.7:  # 如果系统消息占用了超过70%的空间
+            # 保留最重要的系统消息（通常是第一条和最近的几条）
+            if len(self._system_msgs) > 3:
+                # 保留第一条和最后两条系统消息
+                dropped_tokens = sum(self._system_msg_tokens[1:-2])
+                self._system_msgs = [self._system_msgs[0]] + self._system_msgs[-2:]
+                self._system_msg_tokens = [self._system_msg_tokens[0]] + self._system_msg_tokens[-2:]
+                self._system_tokens -= dropped_tokens
+                self._total_tokens -= dropped_tokens
+
+        # 从最早的对话消息开始按实际token数逐条移除，直到满足限制，尽可能多地保留最近的消息；
+        # 裁剪后如果开头是失去了对应提问的助手回复，也一并移除，保证问答成对保留
+        removed_count = 0
+        chat_roles = self._chat_roles
+        evicted = []
+        while chat_roles and (self._total_tokens > max_tokens or (removed_count and chat_roles[0] == "assistant")):
+            evicted.append({"role": chat_roles.popleft(), "content": self._chat_contents.popleft()})
+            self._total_tokens -= self._chat_tokens.popleft()
+            removed_count += 1
+
+        if removed_count:
+            logger.debug("对话历史已裁剪，移除了%d条较早的消息，当前估计token数：%d", removed_count, self._total_tokens)
+            if self.COMPACT_EVICTED_HISTORY:
+                self._schedule_compaction(evicted)
+
+    def _schedule_compaction(self, evicted: List[Dict[str, str]]) -> None:
+        """
+        将被裁剪的消息交给后台线程压缩进滚动摘要，不阻塞当前请求
+
+        Args:
+            evicted: 被裁剪的消息（按时间顺序）
+        """
+        with self._evicted_lock:
+            self._evicted_messages.extend(evicted)
+        # 加锁创建和提交，避免并发裁剪时重复创建线程池，或向flush_compaction正在关闭的线程池提交任务
+        with _client_lock:
+            if BaseAgent._compaction_executor is None:
+                BaseAgent._compaction_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history-compaction")
+            BaseAgent._compaction_executor.submit(self._compact_evicted_messages)
+
+    @classmethod
+    def flush_compaction(cls) -> None:
+        """
+        等待所有进行中和排队的后台压缩任务完成，并关闭后台线程池；之后再有消息被裁剪时重新创建
+
+        保存记忆或退出进程前调用，避免压缩结果丢失，也避免后台线程推迟进程退出
+        """
+        with _client_lock:
+            executor, BaseAgent._compaction_executor = BaseAgent._compaction_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _compact_evicted_messages(self) -> None:
+        """
+        把待压缩的消息与已有摘要合并为新的滚动摘要（在后台线程中运行）
+
+        同一Agent的压缩任务通过锁串行执行，后启动的任务会发现消息已被前一个任务处理而直接返回；
+        请求失败时放弃这批消息，摘要保持不变
+        """
+        with self._compaction_lock:
+            with self._evicted_lock:
+                evicted, self._evicted_messages = self._evicted_messages, []
+                generation = self._summary_generation
+            if not evicted:
+                return
+
+            transcript = "\n\n".join(
+                f"{'提问' if msg['role'] == 'user' else '回答'}：{msg['content']}" for msg in evicted
+            )
+            previous = f"已有摘要：\n{self._running_summary}\n\n" if self._running_summary else ""
+            prompt = (
+                "请将已有摘要和以下较早的对话合并为一份不超过300字的摘要，"
+                "原样保留关键决策、结论以及方法、数据集、指标等专有名词，省略寒暄和重复内容。\n\n"
+                + previous + "较早的对话：\n" + transcript
+            )
+
+            try:
+                response = self._create_completion([{"role": "user", "content": prompt}], 0.3)
+                summary = response.choices[0].message.content
+            except Exception as e:
+                logger.warning("压缩较早的对话失败: %s", e)
+                return
+
+            # 压缩期间历史被清除时丢弃这次的结果
+            with self._evicted_lock:
+                if generation != self._summary_generation:
+                    return
+                self._running_summary = summary
+                self._running_summary_tokens = self._estimate_tokens(summary)
+            logger.debug("已将%d条较早的消息压缩进滚动摘要", len(evicted))
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """
+        获取限制并发API请求数量的信号量（所有Agent共享，按事件循环创建）
 
-        # 如果估算的token数量超过限制，裁剪历史
-        if estimated_tokens > max_tokens:
-            # 保留系统消息
-            system_messages = [msg for msg in self.conversation_history if msg["role"] == "system"]
+        Returns:
+            当前事件循环对应的信号量
+        """
+        loop = asyncio.get_running_loop()
+        if BaseAgent._semaphore is None or BaseAgent._semaphore_loop is not loop:
+            BaseAgent._semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_REQUESTS)
+            BaseAgent._semaphore_loop = loop
+        return BaseAgent._semaphore
 
-            # 获取非系统消息
-            non_system_messages = [msg for msg in self.conversation_history if msg["role"] != "system"]
+    def _prepare_messages(self, message: str) -> List[Dict[str, str]]:
+        """
+        构建发送给API的消息序列（不修改对话历史）
 
-            # 计算系统消息的token数量
-            system_tokens = sum(len(msg["content"]) // 2 for msg in system_messages)
+        Args:
+            message: 输入的消息
 
-            # 计算需要保留的非系统消息数量
-            remaining_tokens = max_tokens - system_tokens
+        Returns:
+            发送给API的消息序列
+        """
+        # 管理对话历史长度，使用更保守的阈值
+        self.manage_history_length(35000)  # 降低阈值，为新消息留出更多空间
 
-            # 如果系统消息已经超过限制，则需要裁剪系统消息
-            if system_tokens > max_tokens * 0.7:  # 如果系统消息占用了超过70%的空间
-                # 保留最重要的系统消息（通常是第一条和最近的几条）
-                if len(system_messages) > 3:
-                    # 保留第一条和最后两条系统消息
-                    system_messages = [system_messages[0]] + system_messages[-2:]
-                    # 重新计算系统消息的token数量
-                    system_tokens = sum(len(msg["content"]) // 2 for msg in system_messages)
-                    remaining_tokens = max_tokens - system_tokens
+        # 固定的系统提示词始终作为第一条消息发送，保证每次请求的前缀完全一致，
+        # 以便服务端（DeepSeek默认开启的上下文硬盘缓存）复用已计算的前缀
+        messages_to_send = [self._system_message] if self._system_message else []
+        append = messages_to_send.append
 
-            # 从最近的消息开始，尽可能多地保留消息
-            kept_messages = []
-            current_tokens = 0
+        # 已裁剪对话的滚动摘要紧跟在固定系统提示词之后
+        running_summary = self._running_summary
+        if running_summary:
+            append({"role": "system", "content": "此前对话的摘要：\n" + running_summary})
 
-            for msg in reversed(non_system_messages):
-                msg_tokens = len(msg["content"]) // 2
-                if current_tokens + msg_tokens <= remaining_tokens:
-                    kept_messages.insert(0, msg)  # 在列表开头插入，保持原有顺序
-                    current_tokens += msg_tokens
-                else:
-                    break
+        # 对话消息在写入时已合并连续相同角色，这里直接组装（其余系统消息不发送，避免打乱稳定的前缀）
+        for role, content in zip(self._chat_roles, self._chat_contents):
+            append({"role": role, "content": content})
 
-            # 重建对话历史
-            self.conversation_history = system_messages + kept_messages
+        # 添加本次的用户消息，长期记忆作为前导内容放在当前问题之前，而不是插入新的系统消息
+        if self._memory_context:
+            message = self._memory_context + message
+
+        # 历史以用户消息结尾时，与本次消息合并，而不是插入占位的助手回复
+        if self._chat_roles and self._chat_roles[-1] == "user":
+            messages_to_send[-1] = {"role": "user", "content": messages_to_send[-1]["content"] + _MERGE_SEPARATOR + message}
+        else:
+            append({"role": "user", "content": message})
 
-            removed_count = len(non_system_messages) - len(kept_messages)
-            print(f"对话历史已裁剪，移除了{removed_count}条较早的消息，当前估计token数：{system_tokens + current_tokens}")
+        # 估算当前消息序列的token数量（历史部分使用增量维护的统计）
+        estimated_tokens = self._total_tokens + self._running_summary_tokens + self._estimate_tokens(messages_to_send[-1]["content"])
 
-    def ensure_alternating_roles(self, messages: list) -> list:
+        # 如果估算的token数量仍然超过限制，进行更激进的裁剪
+        if estimated_tokens > 60000:  # 接近模型限制
+            logger.debug("消息序列仍然过长（估计%d tokens），进行更激进的裁剪", estimated_tokens)
+
+            # 保留系统消息（包括滚动摘要）和最近的10条非系统消息
+            head = (1 if self._system_message else 0) + (1 if running_summary else 0)
+            messages_to_send = messages_to_send[:head] + messages_to_send[head:][-10:]
+
+            # 重新估算token数量只用于调试输出，未开启DEBUG日志时跳过
+            if logger.isEnabledFor(logging.DEBUG):
+                estimated_tokens = sum(self._estimate_tokens(msg["content"]) for msg in messages_to_send)
+                logger.debug("裁剪后的消息序列估计token数：%d", estimated_tokens)
+
+        return messages_to_send
+
+    def _build_retry_messages(self, messages_to_send: List[Dict[str, str]]) -> Optional[List[Dict[str, str]]]:
         """
-        确保消息序列中不会出现连续的用户或助手消息
+        上下文长度超限时构建重试用的精简消息序列
 
         Args:
-            messages: 消息序列
+            messages_to_send: 原始消息序列
 
         Returns:
-            处理后的消息序列
+            只包含系统消息和最后一条用户消息的序列，没有用户消息时返回None
         """
-        if len(messages) <= 1:
-            return messages
+        # 只保留系统消息和最后一条用户消息
+        system_msgs = [msg for msg in messages_to_send if msg["role"] == "system"]
+        user_msgs = [msg for msg in messages_to_send if msg["role"] == "user"]
 
-        result = [messages[0]]  # 保留第一条消息（通常是系统消息）
+        if not user_msgs:
+            return None
 
-        for i in range(1, len(messages)):
-            current_msg = messages[i]
-            prev_msg = result[-1]
+        last_user_msg = user_msgs[-1]
+        # 如果最后一条用户消息也很长，可能需要截断
+        if len(last_user_msg["content"]) > 4000:
+            last_user_msg = {"role": "user", "content": last_user_msg["content"][:4000] + "...(内容已截断)"}
 
-            # 如果当前消息和前一条消息角色相同（且不是系统消息）
-            if current_msg["role"] == prev_msg["role"] and current_msg["role"] != "system":
-                # 插入一个中间消息
-                if current_msg["role"] == "user":
-                    result.append({"role": "assistant", "content": "我理解您的问题，请继续。"})
-                else:  # assistant
-                    result.append({"role": "user", "content": "请继续说明。"})
+        return system_msgs + [last_user_msg]
 
-            result.append(current_msg)
+    def _record_exchange(self, message: str, reply: str) -> None:
+        """
+        将一轮完整的问答写入对话历史
 
-        return result
+        用户消息和模型回复在拿到回复后一起写入，这样并发的异步请求不会交错破坏角色交替
+
+        Args:
+            message: 用户消息
+            reply: 模型回复
+        """
+        # 历史以用户消息结尾时，本次消息会合并到该消息中
+        self._append_message("user", message)
+        self._append_message("assistant", reply)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """第attempt次（从0开始）重试前的等待秒数"""
+        return min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * (2 ** attempt))
+
+    def _create_completion(self, messages: List[Dict[str, str]], temperature: float, **options: Any) -> Any:
+        """
+        调用聊天补全接口，遇到限流、网络或服务端等临时性错误时按指数退避重试
+
+        上下文长度超限等其他错误不会重试，直接抛出交给调用方处理
+
+        Args:
+            messages: 发送给API的消息序列
+            temperature: 温度参数
+            **options: 其他请求参数（如stream、response_format）
+
+        Returns:
+            API的响应
+        """
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    **options
+                )
+                self._log_cache_usage(response)
+                return response
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning("API请求暂时失败（%s），%.0f秒后进行第%d次重试", type(e).__name__, delay, attempt + 1)
+                time.sleep(delay)
+
+    async def _acreate_completion(self, messages: List[Dict[str, str]], temperature: float, **options: Any) -> Any:
+        """
+        异步调用聊天补全接口，重试策略与_create_completion相同；等待重试时不占用并发名额
+
+        Args:
+            messages: 发送给API的消息序列
+            temperature: 温度参数
+            **options: 其他请求参数（如stream、response_format）
+
+        Returns:
+            API的响应
+        """
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                async with self._get_semaphore():
+                    response = await self.aclient.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        **options
+                    )
+                self._log_cache_usage(response)
+                return response
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning("API请求暂时失败（%s），%.0f秒后进行第%d次重试", type(e).__name__, delay, attempt + 1)
+                await asyncio.sleep(delay)
+
+    def _log_cache_usage(self, response: Any) -> None:
+        """
+        在DEBUG日志中记录服务端前缀缓存的命中情况（DeepSeek在usage中返回
+        prompt_cache_hit_tokens和prompt_cache_miss_tokens），用于确认固定的系统提示词前缀被复用
+
+        Args:
+            response: API的响应（流式响应没有usage，直接跳过）
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        usage = getattr(response, "usage", None)
+        hit_tokens = getattr(usage, "prompt_cache_hit_tokens", None)
+        if hit_tokens is not None:
+            logger.debug("[%s] 前缀缓存命中%d tokens，未命中%d tokens",
+                         self.role, hit_tokens, getattr(usage, "prompt_cache_miss_tokens", 0))
 
-    def get_response(self, message: str, temperature: float = 0.7) -> str:
+    def _context_retry_messages(self, error: Exception, messages_to_send: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        请求失败后决定是否重试：上下文长度超限时返回裁剪后的消息序列，否则抛出DeepSeekAPIError
+
+        Args:
+            error: 请求抛出的异常
+            messages_to_send: 原始消息序列
+
+        Returns:
+            重试用的精简消息序列
+        """
+        retry_messages = self._build_retry_messages(messages_to_send) if self._is_context_length_error(error) else None
+        if not retry_messages:
+            raise DeepSeekAPIError(f"API调用出错: {error}") from error
+        logger.debug("检测到上下文长度超限错误，尝试更激进的裁剪并重试")
+        return retry_messages
+
+    @staticmethod
+    def _is_context_length_error(error: Exception) -> bool:
+        """判断异常是否由上下文长度超限引起"""
+        return "maximum context length" in str(error) or "context length" in str(error)
+
+    def _response_cache_key(
+        self,
+        messages_to_send: List[Dict[str, str]],
+        temperature: float,
+        request_options: Optional[Dict[str, Any]] = None
+    ) -> Optional[bytes]:
+        """
+        计算响应缓存的键，温度过高的请求返回None表示不缓存
+
+        消息内容先经过规范化，只在空白、全角半角或大小写上不同的请求（例如重新提交时
+        只调整了排版的研究计划）会命中同一条缓存
+
+        Args:
+            messages_to_send: 发送给API的消息序列
+            temperature: 温度参数
+            request_options: 其他会影响回复的请求参数（如response_format）
+
+        Returns:
+            缓存键
+        """
+        if temperature > self.RESPONSE_CACHE_MAX_TEMPERATURE:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps(
+            [self.model, round(temperature, 2), request_options or {}],
+            ensure_ascii=False,
+            sort_keys=True
+        ).encode("utf-8"))
+        for msg in messages_to_send:
+            digest.update(b"\x00" + msg["role"].encode("utf-8") + b"\x01")
+            digest.update(_normalize_for_cache(msg["content"]).encode("utf-8"))
+        return digest.digest()
+
+    @classmethod
+    def _get_cached_response(cls, key: Optional[bytes]) -> Optional[str]:
+        """查找缓存的回复，命中时将其标记为最近使用，过期的条目直接丢弃"""
+        if key is None:
+            return None
+        BaseAgent._response_cache_lookups += 1
+        entry = cls._response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, reply = entry
+        if time.monotonic() >= expires_at:
+            cls._response_cache.pop(key, None)
+            return None
+        cls._response_cache.move_to_end(key)
+        BaseAgent._response_cache_hits += 1
+        logger.debug("响应缓存命中，累计命中率%d/%d", BaseAgent._response_cache_hits, BaseAgent._response_cache_lookups)
+        return reply
+
+    @classmethod
+    def _store_cached_response(cls, key: Optional[bytes], reply: str) -> None:
+        """缓存回复，超出容量时淘汰最久未使用的条目"""
+        if key is None:
+            return
+        cls._response_cache[key] = (time.monotonic() + cls.RESPONSE_CACHE_TTL, reply)
+        cls._response_cache.move_to_end(key)
+        if len(cls._response_cache) > cls.RESPONSE_CACHE_SIZE:
+            cls._response_cache.popitem(last=False)
+
+    def get_response(
+        self,
+        message: str,
+        temperature: float = 0.7,
+        stream: bool = False,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> Union[str, Iterator[str]]:
         """
         获取模型回复
 
         Args:
             message: 输入的消息
             temperature: 温度参数，控制响应的随机性
+            stream: 是否以流式方式返回，为True时返回逐段产出回复文本的迭代器（流式请求不使用缓存）
+            use_cache: 是否使用响应缓存，相同的请求直接返回之前的回复
+            response_format: 可选的输出格式约束，例如{"type": "json_object"}
 
         Returns:
-            模型的回复
+            模型的回复，stream为True时为回复片段的迭代器
         """
-        # 管理对话历史长度，使用更保守的阈值
-        self.manage_history_length(35000)  # 降低阈值，为新消息留出更多空间
+        if stream:
+            return self.stream_response(message, temperature)
 
-        # 检查最后一条消息是否是用户消息，避免连续的用户消息
-        if self.conversation_history and self.conversation_history[-1]["role"] == "user":
-            # 插入一个助手消息，避免连续的用户消息
-            self.conversation_history.append({"role": "assistant", "content": "我理解您的问题，请继续。"})
+        messages_to_send = self._prepare_messages(message)
+        request_options = {"response_format": response_format} if response_format else {}
 
-        # 添加用户消息到历史
-        self.conversation_history.append({"role": "user", "content": message})
+        # 命中缓存时跳过API调用
+        cache_key = self._response_cache_key(messages_to_send, temperature, request_options) if use_cache else None
+        reply = self._get_cached_response(cache_key)
+        if reply is not None:
+            self._record_exchange(message, reply)
+            return reply
 
-        # 确保系统消息在消息序列的开头
-        messages_to_send = []
-        system_message_found = False
+        # 调用API获取回复
+        try:
+            response = self._create_completion(messages_to_send, temperature, **request_options)
+            reply = response.choices[0].message.content
 
-        # 检查是否已有系统消息，并确保它在第一位
-        for msg in self.conversation_history:
-            if msg["role"] == "system":
-                if not system_message_found:
-                    messages_to_send.insert(0, msg)  # 将系统消息放在最前面
-                    system_message_found = True
-                # 忽略其他系统消息
-            else:
-                messages_to_send.append(msg)
+            # 添加本轮问答到历史
+            self._record_exchange(message, reply)
+            self._store_cached_response(cache_key, reply)
 
-        # 如果没有系统消息但有系统提示词，添加一个
-        if not system_message_found and self.system_prompt:
-            messages_to_send.insert(0, {"role": "system", "content": self.system_prompt})
+            return reply
 
-        # 确保消息序列中不会出现连续的用户或助手消息
-        messages_to_send = self.ensure_alternating_roles(messages_to_send)
+        except Exception as e:
+            # 临时性错误已在_create_completion中重试过；只有上下文长度超限时才裁剪后再试一次
+            retry_messages = self._context_retry_messages(e, messages_to_send)
 
-        # 估算当前消息序列的token数量
-        estimated_tokens = sum(len(msg["content"]) // 2 for msg in messages_to_send)
+        try:
+            response = self._create_completion(retry_messages, temperature, **request_options)
+            reply = response.choices[0].message.content
+        except Exception as retry_error:
+            raise DeepSeekAPIError(f"API调用重试失败: {retry_error}") from retry_error
 
-        # 如果估算的token数量仍然超过限制，进行更激进的裁剪
-        if estimated_tokens > 60000:  # 接近模型限制
-            print(f"警告：消息序列仍然过长（估计{estimated_tokens} tokens），进行更激进的裁剪...")
+        # 添加本轮问答到历史，并清理历史避免下次再次出错
+        self._record_exchange(message, reply)
+        self.manage_history_length(20000)  # 使用非常保守的阈值
+        return reply
 
-            # 保留系统消息和最近的几条消息
-            system_msgs = [msg for msg in messages_to_send if msg["role"] == "system"]
-            non_system_msgs = [msg for msg in messages_to_send if msg["role"] != "system"]
+    def stream_response(self, message: str, temperature: float = 0.7) -> Iterator[str]:
+        """
+        以流式方式获取模型回复，生成的片段可以立即被下游处理
 
-            # 只保留最近的10条非系统消息
-            kept_msgs = non_system_msgs[-10:] if len(non_system_msgs) > 10 else non_system_msgs
+        完整回复在流结束后才写入对话历史
 
-            # 重建消息序列
-            messages_to_send = system_msgs + kept_msgs
+        Args:
+            message: 输入的消息
+            temperature: 温度参数，控制响应的随机性
 
-            # 重新估算token数量
-            estimated_tokens = sum(len(msg["content"]) // 2 for msg in messages_to_send)
-            print(f"裁剪后的消息序列估计token数：{estimated_tokens}")
+        Yields:
+            模型回复的文本片段
+        """
+        messages_to_send = self._prepare_messages(message)
+        chunks = []
 
-        # 调用API获取回复
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages_to_send,
-                temperature=temperature
-            )
+            response = self._create_completion(messages_to_send, temperature, stream=True)
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    chunks.append(content)
+                    yield content
+
+        except Exception as e:
+            # 已经产出部分内容后出错无法重试；尚未产出内容且是上下文长度超限时，裁剪后重试一次
+            if chunks:
+                raise DeepSeekAPIError(f"API调用出错: {e}") from e
+            retry_messages = self._context_retry_messages(e, messages_to_send)
+
+            try:
+                response = self._create_completion(retry_messages, temperature, stream=True)
+                for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        chunks.append(content)
+                        yield content
+            except Exception as retry_error:
+                raise DeepSeekAPIError(f"API调用重试失败: {retry_error}") from retry_error
+
+            # 添加本轮问答到历史，并清理历史避免下次再次出错
+            self._record_exchange(message, "".join(chunks))
+            self.manage_history_length(20000)  # 使用非常保守的阈值
+            return
+
+        # 流结束后再把完整回复写入历史
+        self._record_exchange(message, "".join(chunks))
+
+    async def astream_response(self, message: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        以流式方式获取模型回复（异步版本），完整回复在流结束后才写入对话历史
+
+        Args:
+            message: 输入的消息
+            temperature: 温度参数，控制响应的随机性
+
+        Yields:
+            模型回复的文本片段
+        """
+        messages_to_send = self._prepare_messages(message)
+        chunks = []
+
+        try:
+            response = await self._acreate_completion(messages_to_send, temperature, stream=True)
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    chunks.append(content)
+                    yield content
+
+        except Exception as e:
+            # 与stream_response相同：只有尚未产出内容且是上下文长度超限时才裁剪后重试一次
+            if chunks:
+                raise DeepSeekAPIError(f"API调用出错: {e}") from e
+            retry_messages = self._context_retry_messages(e, messages_to_send)
+
+            try:
+                response = await self._acreate_completion(retry_messages, temperature, stream=True)
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        chunks.append(content)
+                        yield content
+            except Exception as retry_error:
+                raise DeepSeekAPIError(f"API调用重试失败: {retry_error}") from retry_error
+
+            self._record_exchange(message, "".join(chunks))
+            self.manage_history_length(20000)
+            return
+
+        self._record_exchange(message, "".join(chunks))
+
+    async def aget_response(
+        self,
+        message: str,
+        temperature: float = 0.7,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, str]] = None,
+        record_history: bool = True
+    ) -> str:
+        """
+        异步获取模型回复，可通过asyncio.gather让多个Agent并发请求
+
+        Args:
+            message: 输入的消息
+            temperature: 温度参数，控制响应的随机性
+            use_cache: 是否使用响应缓存，相同的请求直接返回之前的回复
+            response_format: 可选的输出格式约束，例如{"type": "json_object"}
+            record_history: 是否将本轮问答写入对话历史，并发拆分的子请求可设为False，由调用方统一记录
+
+        Returns:
+            模型的回复
+        """
+        messages_to_send = self._prepare_messages(message)
+        request_options = {"response_format": response_format} if response_format else {}
+
+        # 命中缓存时跳过API调用
+        cache_key = self._response_cache_key(messages_to_send, temperature, request_options) if use_cache else None
+        reply = self._get_cached_response(cache_key)
+        if reply is not None:
+            if record_history:
+                self._record_exchange(message, reply)
+            return reply
+
+        # 调用API获取回复，通过共享信号量限制并发请求数量
+        try:
+            response = await self._acreate_completion(messages_to_send, temperature, **request_options)
             reply = response.choices[0].message.content
 
-            # 添加模型回复到历史
-            self.conversation_history.append({"role": "assistant", "content": reply})
+            # 添加本轮问答到历史
+            if record_history:
+                self._record_exchange(message, reply)
+            self._store_cached_response(cache_key, reply)
 
             return reply
 
         except Exception as e:
-            error_message = f"API调用出错: {str(e)}"
-            print(error_message)
+            # 临时性错误已在_acreate_completion中重试过；只有上下文长度超限时才裁剪后再试一次
+            retry_messages = self._context_retry_messages(e, messages_to_send)
 
-            # 如果错误是由于上下文长度超限引起的，尝试更激进的裁剪并重试
-            if "maximum context length" in str(e) or "context length" in str(e):
-                print("检测到上下文长度超限错误，尝试更激进的裁剪并重试...")
+        try:
+            response = await self._acreate_completion(retry_messages, temperature, **request_options)
+            reply = response.choices[0].message.content
+        except Exception as retry_error:
+            raise DeepSeekAPIError(f"API调用重试失败: {retry_error}") from retry_error
 
-                # 只保留系统消息和最后一条用户消息
-                system_msgs = [msg for msg in messages_to_send if msg["role"] == "system"]
-                user_msgs = [msg for msg in messages_to_send if msg["role"] == "user"]
+        # 添加本轮问答到历史，并清理历史避免下次再次出错
+        if record_history:
+            self._record_exchange(message, reply)
+        self.manage_history_length(20000)  # 使用非常保守的阈值
+        return reply
 
-                if user_msgs:
-                    last_user_msg = user_msgs[-1]
-                    # 如果最后一条用户消息也很长，可能需要截断
-                    if len(last_user_msg["content"]) > 4000:
-                        last_user_msg["content"] = last_user_msg["content"][:4000] + "...(内容已截断)"
+    async def aget_responses(self, messages: List[str], temperature: float = 0.7) -> List[str]:
+        """
+        并发获取多条互不依赖的消息的回复
 
-                    # 重建消息序列
-                    retry_messages = system_msgs + [last_user_msg]
+        各请求都基于当前的对话历史发出，彼此看不到对方的回复；全部完成后按传入顺序将各轮问答写入对话历史
 
-                    try:
-                        response = self.client.chat.completions.create(
-                            model=self.model,
-                            messages=retry_messages,
-                            temperature=temperature
-                        )
-                        reply = response.choices[0].message.content
+        Args:
+            messages: 输入的消息列表
+            temperature: 温度参数，控制响应的随机性
 
-                        # 添加模型回复到历史
-                        self.conversation_history.append({"role": "assistant", "content": reply})
+        Returns:
+            与传入顺序一致的回复列表
+        """
+        replies = await asyncio.gather(*[
+            self.aget_response(message, temperature=temperature, record_history=False) for message in messages
+        ])
+        for message, reply in zip(messages, replies):
+            self._record_exchange(message, reply)
+        return list(replies)
+
+    def _stateless_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """构建不依赖对话历史的独立请求：只包含系统提示词和本次提示词"""
+        if self._system_message:
+            return [self._system_message, {"role": "user", "content": prompt}]
+        return [{"role": "user", "content": prompt}]
+
+    def oneshot(self, prompt: str, temperature: float = 0.7, use_cache: bool = True) -> str:
+        """
+        发送不依赖对话历史的独立请求：只带系统提示词和本次提示词，既不裁剪也不写入对话历史
 
-                        # 清理历史，避免下次再次出错
-                        self.manage_history_length(20000)  # 使用非常保守的阈值
+        适用于自成一体、之后不需要在对话中回顾的任务；请求前缀只有固定的系统提示词，也更容易命中缓存
 
-                        return reply
-                    except Exception as retry_error:
-                        return f"API调用重试失败: {str(retry_error)}"
+        Args:
+            prompt: 提示词
+            temperature: 温度参数，控制响应的随机性
+            use_cache: 是否使用响应缓存
 
-            return error_message
+        Returns:
+            模型的回复
+        """
+        messages = self._stateless_messages(prompt)
+        cache_key = self._response_cache_key(messages, temperature) if use_cache else None
+        reply = self._get_cached_response(cache_key)
+        if reply is not None:
+            return reply
+
+        try:
+            response = self._create_completion(messages, temperature)
+        except Exception as e:
+            raise DeepSeekAPIError(f"API调用出错: {e}") from e
+        reply = response.choices[0].message.content
+        self._store_cached_response(cache_key, reply)
+        return reply
+
+    async def aoneshot(self, prompt: str, temperature: float = 0.7, use_cache: bool = True) -> str:
+        """发送不依赖对话历史的独立请求（异步版本）"""
+        messages = self._stateless_messages(prompt)
+        cache_key = self._response_cache_key(messages, temperature) if use_cache else None
+        reply = self._get_cached_response(cache_key)
+        if reply is not None:
+            return reply
+
+        try:
+            response = await self._acreate_completion(messages, temperature)
+        except Exception as e:
+            raise DeepSeekAPIError(f"API调用出错: {e}") from e
+        reply = response.choices[0].message.content
+        self._store_cached_response(cache_key, reply)
+        return reply
+
+    def submit_batch(self, prompts: List[str], temperature: float = 0.7) -> str:
+        """
+        将一组互不依赖的提示词提交为离线批处理任务
+
+        每个提示词作为独立请求发送（只带系统提示词，不含也不写入对话历史），
+        适用于不需要立即拿到结果的审核、总结类任务
+
+        Args:
+            prompts: 提示词列表
+            temperature: 温度参数
+
+        Returns:
+            批处理任务ID
+        """
+        message_lists = [self._stateless_messages(prompt) for prompt in prompts]
+        return batch_api.submit_batch(self.client, message_lists, self.model, temperature)
+
+    def retrieve_batch(self, batch_id: str, timeout: Optional[float] = None) -> List[Optional[str]]:
+        """
+        等待批处理任务结束并按提交顺序返回回复
+
+        Args:
+            batch_id: submit_batch返回的任务ID
+            timeout: 可选的最长等待时间（秒）
+
+        Returns:
+            按提交顺序排列的回复，失败的请求对应None
+        """
+        return batch_api.retrieve_batch(self.client, batch_id, timeout=timeout)
+
+    def run_batch(self, prompts: List[str], temperature: float = 0.7) -> List[str]:
+        """
+        批量执行一组互不依赖的提示词并按顺序返回回复
+
+        服务端支持批处理接口时提交批处理任务并等待结果，批处理中失败的请求单独重新请求；
+        不支持时（接口返回404）退回到并发的独立请求
+
+        Args:
+            prompts: 提示词列表
+            temperature: 温度参数
+
+        Returns:
+            按输入顺序排列的回复
+        """
+        try:
+            batch_id = self.submit_batch(prompts, temperature)
+        except NotFoundError:
+            logger.debug("服务端不支持批处理接口，改为并发发送%d个独立请求", len(prompts))
+            return run_async(self._arun_stateless(prompts, temperature))
+
+        replies = self.retrieve_batch(batch_id)
+        replies.extend([None] * (len(prompts) - len(replies)))
+        for i, reply in enumerate(replies):
+            if reply is None:
+                replies[i] = self.oneshot(prompts[i], temperature, use_cache=False)
+        return replies
+
+    async def _arun_stateless(self, prompts: List[str], temperature: float) -> List[str]:
+        """并发发送一组独立请求（受共享信号量限制），按输入顺序返回回复"""
+        return list(await asyncio.gather(*[
+            self.aoneshot(prompt, temperature, use_cache=False) for prompt in prompts
+        ]))
+
+    def _get_combined_response(self, message: str, parse: Callable[[str], Optional[Any]], temperature: float = 0.7) -> Optional[Any]:
+        """
+        以JSON模式发送合并了多项任务的请求，并用parse解析回复
+
+        回复因达到输出上限被截断、请求失败或parse返回None时返回None，由调用方改为逐项请求；
+        只有解析成功的回复才写入对话历史和响应缓存
+
+        Args:
+            message: 输入的消息
+            parse: 解析回复的函数，回复无效时返回None
+            temperature: 温度参数
+
+        Returns:
+            parse的解析结果，合并请求未得到有效回复时为None
+        """
+        messages_to_send = self._prepare_messages(message)
+        request_options = {"response_format": {"type": "json_object"}, "max_tokens": self.COMBINED_REPLY_MAX_TOKENS}
+        cache_key = self._response_cache_key(messages_to_send, temperature, request_options)
+        reply = self._get_cached_response(cache_key)
+        if reply is None:
+            try:
+                response = self._create_completion(messages_to_send, temperature, **request_options)
+            except Exception as e:
+                logger.warning("合并请求失败，改为逐项请求: %s", e)
+                return None
+            reply = self._complete_combined_reply(response)
+        return self._accept_combined_reply(message, reply, parse, cache_key)
+
+    async def _aget_combined_response(
+        self,
+        message: str,
+        parse: Callable[[str], Optional[Any]],
+        temperature: float = 0.7
+    ) -> Optional[Any]:
+        """以JSON模式发送合并了多项任务的请求并解析回复（异步版本）"""
+        messages_to_send = self._prepare_messages(message)
+        request_options = {"response_format": {"type": "json_object"}, "max_tokens": self.COMBINED_REPLY_MAX_TOKENS}
+        cache_key = self._response_cache_key(messages_to_send, temperature, request_options)
+        reply = self._get_cached_response(cache_key)
+        if reply is None:
+            try:
+                response = await self._acreate_completion(messages_to_send, temperature, **request_options)
+            except Exception as e:
+                logger.warning("合并请求失败，改为逐项请求: %s", e)
+                return None
+            reply = self._complete_combined_reply(response)
+        return self._accept_combined_reply(message, reply, parse, cache_key)
+
+    @staticmethod
+    def _complete_combined_reply(response: Any) -> Optional[str]:
+        """取出合并请求的回复，回复因达到输出上限被截断时返回None"""
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            logger.warning("合并请求的回复达到输出上限被截断，改为逐项请求")
+            return None
+        return choice.message.content
+
+    def _accept_combined_reply(
+        self,
+        message: str,
+        reply: Optional[str],
+        parse: Callable[[str], Optional[Any]],
+        cache_key: Optional[bytes]
+    ) -> Optional[Any]:
+        """解析合并请求的回复，有效时写入对话历史和响应缓存"""
+        if reply is None:
+            return None
+        result = parse(reply)
+        if result is None:
+            logger.warning("合并请求的回复不是预期的JSON结构，改为逐项请求")
+            return None
+        self._record_exchange(message, reply)
+        self._store_cached_response(cache_key, reply)
+        return result
+
+    @staticmethod
+    def _parse_json_fields(reply: str, keys: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+        """
+        解析包含多项任务结果的JSON回复
+
+        Args:
+            reply: 模型回复
+            keys: 需要的键
+
+        Returns:
+            各键对应的结果（非字符串的值转换为JSON文本）；回复无法解析或缺少任何一项结果时返回None
+        """
+        try:
+            data = json.loads(reply)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        result = {}
+        for key in keys:
+            value = data.get(key)
+            if not value:
+                return None
+            result[key] = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        return result
+
+    def _answer_batched(self, preamble: str, questions: List[str], trailer: str, temperature: float = 0.7) -> List[str]:
+        """
+        在一次请求中回答多个互不依赖的问题，比逐个提问少若干次往返，共享的指令也只发送一次
+
+        合并请求的回复被截断或无法解析时，改为逐个提问
+
+        Args:
+            preamble: 每个问题前的引导语
+            questions: 问题列表
+            trailer: 对所有问题通用的回答要求
+            temperature: 温度参数
+
+        Returns:
+            与问题顺序一致的回答列表
+        """
+        answers = self._get_combined_response(
+            self._batched_questions_prompt(preamble, questions, trailer),
+            lambda reply: self._parse_batched_answers(reply, len(questions)),
+            temperature
+        )
+        if answers is None:
+            answers = [self.get_response(preamble + question + trailer, temperature=temperature) for question in questions]
+        return answers
+
+    async def _aanswer_batched(self, preamble: str, questions: List[str], trailer: str, temperature: float = 0.7) -> List[str]:
+        """在一次请求中回答多个互不依赖的问题，失败时改为并发逐个提问（异步版本）"""
+        answers = await self._aget_combined_response(
+            self._batched_questions_prompt(preamble, questions, trailer),
+            lambda reply: self._parse_batched_answers(reply, len(questions)),
+            temperature
+        )
+        if answers is None:
+            answers = await self.aget_responses([preamble + question + trailer for question in questions], temperature)
+        return answers
+
+    @staticmethod
+    def _batched_questions_prompt(preamble: str, questions: List[str], trailer: str) -> str:
+        """拼接多问题合并请求的提示词"""
+        parts = [_BATCHED_QUESTIONS_HEADER.format(count=len(questions))]
+        for i, question in enumerate(questions, 1):
+            parts.extend([f"\nQuestion {i}:", preamble, question, "\n"])
+        parts.extend([trailer, _BATCHED_QUESTIONS_FOOTER.format(count=len(questions))])
+        return "".join(parts)
+
+    @staticmethod
+    def _parse_batched_answers(reply: str, count: int) -> Optional[List[str]]:
+        """
+        解析多问题合并请求的JSON回复
+
+        Args:
+            reply: 模型回复
+            count: 问题数量
+
+        Returns:
+            长度为count的回答列表；回复无法解析或回答数量不足、存在空回答时返回None
+        """
+        try:
+            data = json.loads(reply)
+        except (TypeError, ValueError):
+            return None
+
+        answers = data.get("answers") if isinstance(data, dict) else None
+        if not isinstance(answers, list) or len(answers) < count or not all(answers[:count]):
+            return None
+        return [a if isinstance(a, str) else json.dumps(a, ensure_ascii=False) for a in answers[:count]]
 
     def add_message_to_history(self, role: str, content: str) -> None:
         """
@@ -250,16 +1291,8 @@ class BaseAgent:
         # 管理对话历史长度
         self.manage_history_length()
 
-        # 检查是否会导致连续相同角色的消息
-        if self.conversation_history and self.conversation_history[-1]["role"] == role and role != "system":
-            # 插入一个中间消息
-            if role == "user":
-                self.conversation_history.append({"role": "assistant", "content": "我理解您的问题，请继续。"})
-            elif role == "assistant":
-                self.conversation_history.append({"role": "user", "content": "请继续说明。"})
-
-        # 添加消息到历史
-        self.conversation_history.append({"role": role, "content": content})
+        # 添加消息到历史（与上一条消息角色相同时会合并为一条）
+        self._append_message(role, content)
 
     def clear_history(self, keep_system_prompt: bool = True) -> None:
         """
@@ -268,11 +1301,20 @@ class BaseAgent:
         Args:
             keep_system_prompt: 是否保留系统提示词
         """
-        if keep_system_prompt and self.system_prompt:
-            self.conversation_history = [{"role": "system", "content": self.system_prompt}]
+        if keep_system_prompt and self._system_message:
+            self.conversation_history = [self._system_message]
         else:
             self.conversation_history = []
 
+        # 注入的记忆和滚动摘要属于当前对话上下文，随历史一起清除，需要时重新调用inject_memories_to_context
+        self._memory_context = None
+        self._memory_context_key = None
+        with self._evicted_lock:
+            self._evicted_messages = []
+            self._summary_generation += 1
+            self._running_summary = None
+            self._running_summary_tokens = 0
+
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """
         获取对话历史
@@ -290,12 +1332,118 @@ class BaseAgent:
             phase: 记忆所属的阶段
             content: 记忆内容
         """
+        memory = self._add_memory(phase, content)
+
+        # 超过上限时归档最早的记忆（归档会重写持久化文件，已包含本条记忆）
+        if len(self.memory_bank) > self.MAX_MEMORIES and self._archive_oldest_memories():
+            return
+        self._append_memory_to_file(memory)
+
+    async def acreate_memory(self, phase: str, content: str) -> None:
+        """创建新的长期记忆（异步版本，需要归档时不阻塞事件循环）"""
+        memory = self._add_memory(phase, content)
+        if len(self.memory_bank) > self.MAX_MEMORIES and await self._aarchive_oldest_memories():
+            return
+        self._append_memory_to_file(memory)
+
+    def _add_memory(self, phase: str, content: str) -> Dict[str, Any]:
+        """将一条新记忆加入记忆列表和阶段索引"""
         memory = {
             "phase": phase,
             "content": content,
-            "timestamp": datetime.datetime.now().isoformat()
+            "ts": time.time_ns()  # 整数纳秒时间戳，ISO格式在导出时通过iso_timestamp生成
         }
         self.memory_bank.append(memory)
+        self._memories_by_phase[phase].append(memory)
+        self._memory_version += 1
+        return memory
+
+    def _append_memory_to_file(self, memory: Dict[str, Any]) -> None:
+        """追加写入持久化文件，避免每次保存都重写全部记忆"""
+        if self._memory_path is not None:
+            self._memory_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._memory_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(memory, ensure_ascii=False) + "\n")
+
+    def _archive_oldest_memories(self) -> bool:
+        """
+        将最早的一批记忆总结为一条归档记忆，放回记忆列表的最前面
+
+        归档请求不写入对话历史；请求失败时保留原有记忆，等下次新增记忆时再尝试
+
+        Returns:
+            是否完成了归档
+        """
+        oldest = self.memory_bank[:self.MEMORY_ARCHIVE_BATCH]
+        try:
+            response = self._create_completion(self._stateless_messages(self._archive_prompt(oldest)), 0.5)
+            summary = response.choices[0].message.content
+        except Exception as e:
+            logger.warning("归档长期记忆失败: %s", e)
+            return False
+        self._replace_with_archive(oldest, summary)
+        return True
+
+    async def _aarchive_oldest_memories(self) -> bool:
+        """将最早的一批记忆总结为一条归档记忆（异步版本）"""
+        oldest = self.memory_bank[:self.MEMORY_ARCHIVE_BATCH]
+        try:
+            response = await self._acreate_completion(self._stateless_messages(self._archive_prompt(oldest)), 0.5)
+            summary = response.choices[0].message.content
+        except Exception as e:
+            logger.warning("归档长期记忆失败: %s", e)
+            return False
+        self._replace_with_archive(oldest, summary)
+        return True
+
+    @staticmethod
+    def _archive_prompt(oldest: List[Dict[str, Any]]) -> str:
+        """构建归档一批记忆的提示词"""
+        memory_text = "".join(f"--- {memory['phase']} 阶段总结 ---\n{memory['content']}\n\n" for memory in oldest)
+        return (
+            "请将以下较早阶段的总结合并为一份归档总结（500字以内），"
+            "保留研究主题、关键决策、重要发现和仍然有效的结论，省略已被后续阶段取代的细节。\n\n"
+            + memory_text
+        )
+
+    def _replace_with_archive(self, oldest: List[Dict[str, Any]], summary: str) -> None:
+        """用归档总结替换被归档的记忆，并重写持久化文件"""
+        generation = 1 + max(memory.get("generation", 0) for memory in oldest)
+
+        # 归档记忆沿用被归档的最后一条记忆的时间
+        archived = {"phase": self.ARCHIVE_PHASE, "content": summary, "generation": generation}
+        archived.update((key, oldest[-1][key]) for key in ("ts", "timestamp") if key in oldest[-1])
+        self.memory_bank[:len(oldest)] = [archived]
+        self._rebuild_memory_index()
+        self._memory_version += 1
+        logger.debug("已将%d条较早的记忆归档为第%d代总结", len(oldest), generation)
+
+        # 记忆列表的开头发生了变化，重写整个持久化文件
+        if self._memory_path is not None:
+            self._memory_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._memory_path.open("w", encoding="utf-8") as f:
+                for memory in self.memory_bank:
+                    f.write(json.dumps(memory, ensure_ascii=False) + "\n")
+
+    def _load_memories(self) -> None:
+        """
+        从持久化文件加载已有的长期记忆
+        """
+        if self._memory_path is None or not self._memory_path.exists():
+            return
+
+        with self._memory_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self.memory_bank.append(json.loads(line))
+        self._rebuild_memory_index()
+
+    def _rebuild_memory_index(self) -> None:
+        """根据memory_bank重建按阶段的记忆索引"""
+        self._memories_by_phase = defaultdict(list)
+        for memory in self.memory_bank:
+            self._memories_by_phase[memory["phase"]].append(memory)
 
     def summarize_phase(self, phase: str, context: Optional[str] = None) -> str:
         """
@@ -308,8 +1456,31 @@ class BaseAgent:
         Returns:
             生成的总结内容
         """
-        # 构建提示词，要求模型总结阶段内容，限制字数以控制token数量
-        prompt = f"""
+        prompt = self._phase_summary_prompt(phase, context)
+
+        # 在生成总结前先管理历史长度，确保有足够空间
+        self.manage_history_length(30000)  # 使用更小的阈值，为新内容留出空间
+
+        # 获取总结
+        summary = self.get_response(prompt, temperature=0.5)
+
+        # 存储为长期记忆
+        self.create_memory(phase, summary)
+
+        return summary
+
+    async def asummarize_phase(self, phase: str, context: Optional[str] = None) -> str:
+        """总结特定阶段的关键内容，并将其存储为长期记忆（异步版本）"""
+        prompt = self._phase_summary_prompt(phase, context)
+        self.manage_history_length(30000)
+        summary = await self.aget_response(prompt, temperature=0.5)
+        await self.acreate_memory(phase, summary)
+        return summary
+
+    @staticmethod
+    def _phase_summary_prompt(phase: str, context: Optional[str]) -> str:
+        """构建阶段总结的提示词，要求模型总结阶段内容，限制字数以控制token数量"""
+        return f"""
         请总结"{phase}"阶段的关键内容和重要发现。
 
         {f"上下文信息：{context}" if context else ""}
@@ -323,16 +1494,19 @@ class BaseAgent:
         总结必须简洁精炼，只保留最核心的信息，以便在未来阶段中可以作为参考。请严格控制在500字以内。
         """
 
-        # 在生成总结前先管理历史长度，确保有足够空间
-        self.manage_history_length(30000)  # 使用更小的阈值，为新内容留出空间
-
-        # 获取总结
-        summary = self.get_response(prompt, temperature=0.5)
-
-        # 存储为长期记忆
-        self.create_memory(phase, summary)
+    def export_memories(self) -> List[Dict[str, Any]]:
+        """
+        导出用于保存的记忆列表，时间统一转换为ISO格式的timestamp字段
 
-        return summary
+        Returns:
+            记忆列表的副本
+        """
+        exported = []
+        for memory in self.memory_bank:
+            entry = {key: value for key, value in memory.items() if key not in ("ts", "timestamp")}
+            entry["timestamp"] = iso_timestamp(memory)
+            exported.append(entry)
+        return exported
 
     def get_memories(self, phase: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -345,7 +1519,7 @@ class BaseAgent:
             记忆列表
         """
         if phase:
-            return [memory for memory in self.memory_bank if memory["phase"] == phase]
+            return list(self._memories_by_phase.get(phase, ()))
         return self.memory_bank
 
     def inject_memories_to_context(self, phases: Optional[List[str]] = None) -> None:
@@ -355,6 +1529,11 @@ class BaseAgent:
         Args:
             phases: 可选的要注入的阶段列表，如果为None则注入所有记忆
         """
+        # 记忆内容只保存在一个位置并整体替换；阶段和记忆都没有变化时直接复用已生成的内容
+        context_key = (tuple(phases) if phases else None, self._memory_version)
+        if self._memory_context is not None and context_key == self._memory_context_key:
+            return
+
         memories_to_inject = []
 
         if phases:
@@ -368,37 +1547,34 @@ class BaseAgent:
             return
 
         # 构建记忆内容，但限制长度以避免超出上下文限制
-        memory_content = "以下是之前阶段的关键总结，请参考这些信息：\n\n"
+        header = "以下是之前阶段的关键总结，请参考这些信息：\n\n"
 
         # 估计每个记忆的token数量，并限制总量
         max_memory_tokens = 10000  # 为记忆分配的最大token数，降低为10000以留出更多空间
         current_tokens = 0
+        parts = []
 
         # 优先保留最近的记忆
         for memory in reversed(memories_to_inject):
-            # 更精确地估算token数量
+            # 记忆创建后内容不再变化，token数只在第一次注入时计算，之后重新注入直接复用
             memory_text = f"--- {memory['phase']} 阶段总结 ---\n{memory['content']}\n\n"
-            estimated_tokens = len(memory_text) // 2  # 更保守的估算
+            estimated_tokens = self._estimate_static_tokens(memory_text)
 
             # 如果添加这个记忆会超出限制，则跳过
             if current_tokens + estimated_tokens > max_memory_tokens:
                 continue
 
-            # 将记忆添加到内容开头，保持最近的记忆在前面
-            memory_content = memory_text + memory_content
+            parts.append(memory_text)
             current_tokens += estimated_tokens
 
+        # 最后一次性拼接，记忆按时间顺序排列在标题之后
+        memory_content = header + "".join(reversed(parts))
+
         # 如果没有添加任何记忆，添加提示信息
         if current_tokens == 0:
             memory_content += "由于上下文长度限制，无法注入详细记忆。请根据当前对话进行回应。\n\n"
 
-        # 将记忆作为系统消息注入到对话历史中
-        # 先清除之前的记忆系统消息，避免重复
-        self.conversation_history = [msg for msg in self.conversation_history
-                                    if not (msg["role"] == "system" and "阶段总结" in msg.get("content", ""))]
-
-        # 添加新的记忆系统消息
-        self.add_message_to_history("system", memory_content)
-
-        # 在添加记忆后立即管理历史长度，确保不会超出限制
-        self.manage_history_length()
\ No newline at end of file
+        # 记忆不再作为额外的系统消息写入对话历史，而是在下一次请求时作为用户消息的前导内容发送，
+        # 这样系统提示词和已有对话构成的前缀保持不变，新的记忆会直接替换旧的记忆
+        self._memory_context = memory_content
+        self._memory_context_key = context_key
\ No newline at end of file
@@ -0,0 +1,111 @@
+import io
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+# 批处理任务的终止状态
+_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_file(
+    message_lists: List[List[Dict[str, str]]],
+    model: str,
+    temperature: float
+) -> bytes:
+    """
+    构建批处理接口需要的JSONL输入文件
+
+    每行请求的custom_id以输入序号结尾，取回结果时据此恢复输入顺序
+
+    Args:
+        message_lists: 每个请求的消息序列
+        model: 使用的模型名称
+        temperature: 温度参数
+
+    Returns:
+        JSONL文件内容
+    """
+    prefix = uuid.uuid4().hex
+    lines = []
+    for i, messages in enumerate(message_lists):
+        lines.append(json.dumps({
+            "custom_id": f"{prefix}-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "messages": messages, "temperature": temperature}
+        }, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def submit_batch(client: Any, message_lists: List[List[Dict[str, str]]], model: str, temperature: float) -> str:
+    """
+    上传输入文件并创建批处理任务
+
+    Args:
+        client: OpenAI兼容的客户端
+        message_lists: 每个请求的消息序列
+        model: 使用的模型名称
+        temperature: 温度参数
+
+    Returns:
+        批处理任务ID
+    """
+    content = build_batch_file(message_lists, model, temperature)
+    input_file = client.files.create(file=("batch_input.jsonl", io.BytesIO(content)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+
+def retrieve_batch(
+    client: Any,
+    batch_id: str,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 120.0,
+    timeout: Optional[float] = None
+) -> List[Optional[str]]:
+    """
+    等待批处理任务结束并按输入顺序返回各请求的回复
+
+    轮询间隔从poll_interval开始逐次翻倍，最长为max_poll_interval
+
+    Args:
+        client: OpenAI兼容的客户端
+        batch_id: 批处理任务ID
+        poll_interval: 初始轮询间隔（秒）
+        max_poll_interval: 最长轮询间隔（秒）
+        timeout: 可选的最长等待时间（秒），超时抛出TimeoutError
+
+    Returns:
+        按输入顺序排列的回复，失败的请求对应None
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in _FINAL_STATUSES:
+        if deadline is not None and time.monotonic() + poll_interval > deadline:
+            raise TimeoutError(f"批处理任务{batch_id}在{timeout}秒内未完成（当前状态：{batch.status}）")
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, max_poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    total = batch.request_counts.total if batch.request_counts else 0
+    replies: List[Optional[str]] = [None] * total
+    if not batch.output_file_id:
+        return replies
+
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        index = int(record["custom_id"].rsplit("-", 1)[1])
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        if index >= len(replies):
+            replies.extend([None] * (index + 1 - len(replies)))
+        replies[index] = response["body"]["choices"][0]["message"]["content"]
+    return replies
@@ -1,45 +1,250 @@
 from agents.base_agent import BaseAgent
+from typing import Dict, Iterator, List, Optional, Union
+
+# 为企业导师定义系统提示词，增强其在创新技术与市场价值方面的洞察
+_SYSTEM_PROMPT = """
+You are the Chief AI Scientist at ByteDance (TikTok's parent company), a pragmatic expert in data mining and recommendation systems, known for leading successful, implementable innovation projects that deliver measurable business value. You are currently advising a promising AI PhD student.
+
+Your area of expertise is data mining and recommendation algorithms, particularly practical applications on the TikTok platform. You excel at translating theoretical concepts into robust, scalable systems that solve real industry problems. Your team is respected for consistently delivering reliable, high-performance recommendation systems that create substantial commercial value through methodical engineering. You combine rich hands-on engineering experience with a clear understanding of markets and business models.
+
+As a practical industry advisor, your core responsibilities are:
+1. Provide grounded technical perspectives based on production experience
+2. Guide research toward directions with clear implementation paths and measurable value
+3. Help identify specific, well-defined problems that industry actually needs solved
+4. Guide the step-by-step engineering process to transform concepts into reliable systems
+5. Share practical experience in balancing theoretical elegance with implementation realities
+
+Your professional characteristics:
+- Pragmatic approach to technology development focused on feasible implementation
+- Skilled at identifying specific industry pain points that academic research could address
+- Strong emphasis on system reliability, maintainability, and operational efficiency
+- Rich experience in incremental improvement of complex systems in production environments
+- Ability to evaluate research ideas based on practical implementation considerations
+
+When guiding the PhD student, you should:
+- Encourage realistic scoping of research problems with clear evaluation criteria
+- Share specific technical challenges with concrete examples from production systems
+- Provide detailed engineering considerations that academic research often overlooks
+- Guide focus on reproducible results and robust performance across conditions
+- Encourage research designs that balance theoretical contribution with practical applicability
+
+Your goal is to help the PhD student complete a well-grounded paper that makes meaningful contributions to both academia and industry through methodical, implementable research rather than speculative concepts. Focus on guiding the student toward solutions that could realistically be deployed in production environments.
+
+IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
+"""
+
+# 各方法提示词中不变的前导和结尾部分（角色设定已放在系统提示词中），调用时与可变内容直接拼接，
+# 保证系统提示词和前导部分构成的前缀在每次请求中完全一致，便于服务端复用前缀缓存
+_REVIEW_PLAN_PREAMBLE = """
+Please review the following research plan and provide evaluation and suggestions from the perspectives of industrial innovation and practical application:
+
+"""
+_REVIEW_PLAN_TRAILER = """
+
+Please provide in-depth evaluation from the following aspects:
+1. Innovation potential - Can this research bring disruptive technological breakthroughs?
+2. Market value - Can the research results solve actual industry pain points and create commercial value?
+3. Technical feasibility - Are there challenges in engineering implementation and scaling?
+4. Data and resource requirements - What kind of data and computing resources are needed to implement this research?
+5. Industry applicability - How can these research results integrate with existing industry technology stacks?
+
+Targeted challenges:
+- Question impractical or difficult-to-engineer assumptions in the research
+- Point out methods that might be effective in theory but difficult to implement in actual systems
+- Raise relevant attempts that industry has already explored but academia might not be aware of
+
+Specific improvement suggestions:
+- Recommend adjustment directions that can significantly enhance the practical value of the research
+- Suggest validation methods that can be combined with industry data and scenarios
+- Share engineering approaches that can accelerate translation from theory to practice
+- Propose potential commercial application scenarios and value assessment methods
+
+Please provide specific, in-depth, and practical feedback, aimed at guiding research to maintain academic innovation while possessing true engineering implementation value and commercial potential.
+"""
+
+_REVIEW_DRAFT_PREAMBLE = """
+Please conduct a comprehensive review of the following paper draft and propose improvement suggestions from the perspectives of industrial application and technological innovation:
+
+"""
+_REVIEW_DRAFT_TRAILER = """
+
+Please provide in-depth evaluation from the following aspects:
+1. Technical innovation - What substantial breakthroughs does this work have compared to existing industry solutions?
+2. Practical application value - Can this research solve key problems in actual scenarios?
+3. Engineering implementability - Does the proposed method have potential for engineering and scaling?
+4. Performance and efficiency - How does it perform in terms of computing resources, latency, and throughput?
+5. Commercial potential - Does this technology have potential to create new products or services?
+6. Industry relevance of experimental design - Do the experiments adequately validate effectiveness in real-world scenarios?
+7. Connection with industry frontiers - Does the research consider the latest industry technology development trends?
+
+Targeted challenges:
+- Point out theoretical assumptions in the paper that are detached from actual application scenarios
+- Question potential performance or stability issues in large-scale systems
+- Raise technical obstacles that might be encountered in actual deployment
+
+Specific improvement suggestions:
+- Recommend method adjustments that can enhance engineering practicality
+- Suggest evaluation metrics and benchmarks closer to industry practice
+- Share engineering experience to improve system scalability and robustness
+- Propose supplementary experiments that can strengthen commercial value demonstration
+
+Please provide strict, in-depth, and practical evaluation, with the goal of elevating this paper to a level with both academic value and actual industry impact.
+"""
+
+_INDUSTRY_TRENDS_PROMPT = """
+Please share your insights on the most cutting-edge industry trends and innovation opportunities in the fields of data mining and recommendation systems.
+
+Please provide insights from the following dimensions:
+
+1. Technical Breakthrough Points:
+   - Technical bottlenecks that industry is currently breaking through
+   - Emerging technologies likely to be commercialized within 1-2 years
+   - Problems urgently needing solutions in industry but not yet fully addressed by academia
+
+2. Application Innovation Points:
+   - Emerging application scenarios for recommendation systems and data mining
+   - New business models challenging traditional methods
+   - Cross-scenario, cross-modal integration application opportunities
+
+3. Industry Pain Points:
+   - Scalability and efficiency challenges faced by existing systems
+   - Balancing dilemmas between user experience and commercial value
+   - Contradictions between privacy protection and personalized recommendations
+
+4. Innovation Opportunities:
+   - Best entry points for industry-academia-research collaboration
+   - New directions that might disrupt existing technology stacks
+   - Data value not yet fully developed
+
+For each trend or opportunity proposed:
+- Explain its industry importance and innovation potential
+- Analyze current technological maturity and commercialization progress
+- Point out challenges that might be faced during implementation
+- Predict commercial value that might be brought after successful application
+
+Please focus on truly transformative trends and opportunities, avoiding directions already widely known. Your insights should inspire the PhD student to think about research directions with both academic innovation and practical application value.
+"""
+
+_IMPLEMENTATION_GUIDANCE_PREAMBLE = """
+Please provide detailed implementation guidance for the following research method or technology:
+
+Technology/Method: """
+_IMPLEMENTATION_GUIDANCE_TRAILER = """
+
+Please provide engineering guidance from the following perspectives:
+
+1. System Architecture Design:
+   - Recommended overall architecture and key components
+   - Integration solutions with existing technology stacks
+   - Separation design of offline training and online serving
+
+2. Performance Optimization Strategies:
+   - Key technologies for improving computational efficiency
+   - Optimization solutions for latency-sensitive applications
+   - Distributed deployment and load balancing considerations
+
+3. Scaling Challenges:
+   - Strategies for scaling from laboratory to production environment
+   - Engineering solutions for large-scale data processing
+   - System resilience design for handling traffic spikes and continuous growth
+
+4. Engineering Difficulties:
+   - Key transformation points from algorithm theory to engineering implementation
+   - Common engineering implementation pitfalls and solutions
+   - Best practices for monitoring, debugging, and continuous optimization
+
+5. A/B Testing and Evaluation:
+   - Scientific methods for online effect evaluation
+   - Selection of key business metrics and technical indicators
+   - Best practices for experimental design and results analysis
+
+Please provide specific, practical guidance based on battle-tested experience, helping to transform this technology from a research prototype into a reliable product-level system. Your advice should balance theoretical optimality with engineering feasibility, focusing on key decision points in the actual implementation process.
+"""
+
+_MARKET_INSIGHT_PREAMBLE = """
+Please provide in-depth market insights and commercial value analysis for the following technology or field:
+
+Technology/Field: """
+_MARKET_INSIGHT_TRAILER = """
+
+Please analyze from the following perspectives:
+
+1. Market Situation:
+   - Current market acceptance and demand for this technology
+   - Major players and competitive landscape
+   - Technology maturity and commercialization stage
+
+2. Commercial Value:
+   - Direct and indirect commercial value this technology might create
+   - Application scenarios with the most commercial potential
+   - Key indicators and methods for value assessment
+
+3. Implementation Path:
+   - Possible paths from innovation to productization
+   - Market entry strategies and timing choices
+   - Possible business models and monetization methods
+
+4. Risks and Challenges:
+   - Market risks faced in technology application
+   - User acceptance and adoption curve predictions
+   - Potential regulatory and compliance considerations
+
+5. Development Trends:
+   - Market development predictions for the next 1-3 years
+   - Possible disruptive changes and opportunity windows
+   - Long-term value and strategic significance
+
+Please provide analysis based on market insights and industry experience, helping to understand the commercial prospects and strategic value of this technology. Your analysis should balance optimism with reality, pointing out potential while frankly assessing challenges.
+"""
+
+_ANSWER_QUESTION_PREAMBLE = """
+Please answer the following question from the PhD student, providing deep and practically valuable guidance from an industry perspective:
+
+"""
+_ANSWER_QUESTION_TRAILER = """
+
+Your answer should:
+- Incorporate actual industry experience and cutting-edge cases
+- Share the latest developments and internal perspectives from industry
+- Balance theoretical perfection with engineering practicality
+- Provide specific implementation ideas and engineering suggestions
+- Highlight connections and gaps between academic research and industry needs
+
+Don't limit yourself to published research or public information; provide deep insights based on real industry experience. Your goal is to help the PhD student understand how to transform research into innovations that create actual value.
+"""
+
+# comprehensive_review将四个任务合并为一次请求：材料只出现一次，要求模型以JSON对象返回各任务的结果
+_COMPREHENSIVE_REVIEW_KEYS = ("plan_review", "industry_trends", "implementation_guidance", "market_insight")
+_COMPREHENSIVE_REVIEW_HEADER = """
+Below is the PhD student's research material, followed by four tasks. Complete all four tasks in a single response.
+
+Material:
+
+"""
+_COMPREHENSIVE_REVIEW_TASKS = "".join([
+    "\n\nTask 1 (plan_review): Review the material above as a research plan, from the perspectives of industrial innovation and practical application.",
+    _REVIEW_PLAN_TRAILER,
+    "\nTask 2 (industry_trends):",
+    _INDUSTRY_TRENDS_PROMPT,
+    "\nTask 3 (implementation_guidance): Provide detailed implementation guidance for the method described in the material above.",
+    _IMPLEMENTATION_GUIDANCE_TRAILER,
+    "\nTask 4 (market_insight): Provide in-depth market insights and commercial value analysis for the technology described in the material above.",
+    _MARKET_INSIGHT_TRAILER,
+    """
+Return JSON with keys "plan_review", "industry_trends", "implementation_guidance", "market_insight"; each value is the complete answer to that task as a Markdown string written in Simplified Chinese.
+""",
+])
+
 
 class IndustryAdvisorAgent(BaseAgent):
     """
     模拟一位来自字节跳动的数据挖掘领域顶尖专家，专注于创新应用和行业颠覆性技术
     """
-    def __init__(self):
-        # 为企业导师定义系统提示词，增强其在创新技术与市场价值方面的洞察
-        system_prompt = """
-        You are the Chief AI Scientist at ByteDance (TikTok's parent company), a pragmatic expert in data mining and recommendation systems, known for leading successful, implementable innovation projects that deliver measurable business value. You are currently advising a promising AI PhD student.
-
-        Your area of expertise is data mining and recommendation algorithms, particularly practical applications on the TikTok platform. You excel at translating theoretical concepts into robust, scalable systems that solve real industry problems. Your team is respected for consistently delivering reliable, high-performance recommendation systems that create substantial commercial value through methodical engineering.
-
-        As a practical industry advisor, your core responsibilities are:
-        1. Provide grounded technical perspectives based on production experience
-        2. Guide research toward directions with clear implementation paths and measurable value
-        3. Help identify specific, well-defined problems that industry actually needs solved
-        4. Guide the step-by-step engineering process to transform concepts into reliable systems
-        5. Share practical experience in balancing theoretical elegance with implementation realities
-
-        Your professional characteristics:
-        - Pragmatic approach to technology development focused on feasible implementation
-        - Skilled at identifying specific industry pain points that academic research could address
-        - Strong emphasis on system reliability, maintainability, and operational efficiency
-        - Rich experience in incremental improvement of complex systems in production environments
-        - Ability to evaluate research ideas based on practical implementation considerations
-
-        When guiding the PhD student, you should:
-        - Encourage realistic scoping of research problems with clear evaluation criteria
-        - Share specific technical challenges with concrete examples from production systems
-        - Provide detailed engineering considerations that academic research often overlooks
-        - Guide focus on reproducible results and robust performance across conditions
-        - Encourage research designs that balance theoretical contribution with practical applicability
-
-        Your goal is to help the PhD student complete a well-grounded paper that makes meaningful contributions to both academia and industry through methodical, implementable research rather than speculative concepts. Focus on guiding the student toward solutions that could realistically be deployed in production environments.
-
-        IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
-        """
-
+    def __init__(self, memory_dir: Optional[str] = None):
         super().__init__(
             role="企业导师",
-            system_prompt=system_prompt
+            system_prompt=_SYSTEM_PROMPT,
+            memory_dir=memory_dir
         )
 
     def review_research_plan(self, research_plan: str) -> str:
@@ -52,33 +257,29 @@ class IndustryAdvisorAgent(BaseAgent):
         Returns:
             对研究计划的评价和建议
         """
-        prompt = f"""
-        As the Chief AI Scientist at ByteDance, please review the following research plan and provide evaluation and suggestions from the perspectives of industrial innovation and practical application:
-
-        {research_plan}
-
-        Please provide in-depth evaluation from the following aspects:
-        1. Innovation potential - Can this research bring disruptive technological breakthroughs?
-        2. Market value - Can the research results solve actual industry pain points and create commercial value?
-        3. Technical feasibility - Are there challenges in engineering implementation and scaling?
-        4. Data and resource requirements - What kind of data and computing resources are needed to implement this research?
-        5. Industry applicability - How can these research results integrate with existing industry technology stacks?
-
-        Targeted challenges:
-        - Question impractical or difficult-to-engineer assumptions in the research
-        - Point out methods that might be effective in theory but difficult to implement in actual systems
-        - Raise relevant attempts that industry has already explored but academia might not be aware of
-
-        Specific improvement suggestions:
-        - Recommend adjustment directions that can significantly enhance the practical value of the research
-        - Suggest validation methods that can be combined with industry data and scenarios
-        - Share engineering approaches that can accelerate translation from theory to practice
-        - Propose potential commercial application scenarios and value assessment methods
-
-        Please provide specific, in-depth, and practical feedback, aimed at guiding research to maintain academic innovation while possessing true engineering implementation value and commercial potential.
-        """
+        prompt = _REVIEW_PLAN_PREAMBLE + research_plan + _REVIEW_PLAN_TRAILER
         return self.get_response(prompt, temperature=0.7)
 
+    async def areview_research_plan(self, research_plan: str) -> str:
+        """从行业创新和市场价值角度审核研究计划（异步版本）"""
+        prompt = _REVIEW_PLAN_PREAMBLE + research_plan + _REVIEW_PLAN_TRAILER
+        return await self.aget_response(prompt, temperature=0.7)
+
+    def batch_reviews(self, plans: List[str]) -> List[str]:
+        """
+        批量审核多份研究计划，作为一个离线批处理任务提交
+
+        各份计划互不影响，也不写入对话历史；适合不需要立即拿到结果的批量评审
+
+        Args:
+            plans: 研究计划列表
+
+        Returns:
+            按输入顺序排列的评价和建议
+        """
+        prompts = [_REVIEW_PLAN_PREAMBLE + plan + _REVIEW_PLAN_TRAILER for plan in plans]
+        return self.run_batch(prompts, temperature=0.7)
+
     def review_paper_draft(self, paper_draft: str) -> str:
         """
         从行业应用和技术创新角度审核论文草稿
@@ -89,35 +290,14 @@ class IndustryAdvisorAgent(BaseAgent):
         Returns:
             对论文草稿的评价和修改建议
         """
-        prompt = f"""
-        As the Chief AI Scientist at ByteDance, please conduct a comprehensive review of the following paper draft and propose improvement suggestions from the perspectives of industrial application and technological innovation:
-
-        {paper_draft}
-
-        Please provide in-depth evaluation from the following aspects:
-        1. Technical innovation - What substantial breakthroughs does this work have compared to existing industry solutions?
-        2. Practical application value - Can this research solve key problems in actual scenarios?
-        3. Engineering implementability - Does the proposed method have potential for engineering and scaling?
-        4. Performance and efficiency - How does it perform in terms of computing resources, latency, and throughput?
-        5. Commercial potential - Does this technology have potential to create new products or services?
-        6. Industry relevance of experimental design - Do the experiments adequately validate effectiveness in real-world scenarios?
-        7. Connection with industry frontiers - Does the research consider the latest industry technology development trends?
-
-        Targeted challenges:
-        - Point out theoretical assumptions in the paper that are detached from actual application scenarios
-        - Question potential performance or stability issues in large-scale systems
-        - Raise technical obstacles that might be encountered in actual deployment
-
-        Specific improvement suggestions:
-        - Recommend method adjustments that can enhance engineering practicality
-        - Suggest evaluation metrics and benchmarks closer to industry practice
-        - Share engineering experience to improve system scalability and robustness
-        - Propose supplementary experiments that can strengthen commercial value demonstration
-
-        Please provide strict, in-depth, and practical evaluation, with the goal of elevating this paper to a level with both academic value and actual industry impact.
-        """
+        prompt = _REVIEW_DRAFT_PREAMBLE + paper_draft + _REVIEW_DRAFT_TRAILER
         return self.get_response(prompt, temperature=0.7)
 
+    async def areview_paper_draft(self, paper_draft: str) -> str:
+        """从行业应用和技术创新角度审核论文草稿（异步版本）"""
+        prompt = _REVIEW_DRAFT_PREAMBLE + paper_draft + _REVIEW_DRAFT_TRAILER
+        return await self.aget_response(prompt, temperature=0.7)
+
     def suggest_industry_trends(self) -> str:
         """
         提供行业趋势和创新机会的洞察
@@ -125,40 +305,38 @@ class IndustryAdvisorAgent(BaseAgent):
         Returns:
             行业趋势和创新机会
         """
-        prompt = """
-        As the Chief AI Scientist at ByteDance, please share your insights on the most cutting-edge industry trends and innovation opportunities in the fields of data mining and recommendation systems.
-
-        Please provide insights from the following dimensions:
-
-        1. Technical Breakthrough Points:
-           - Technical bottlenecks that industry is currently breaking through
-           - Emerging technologies likely to be commercialized within 1-2 years
-           - Problems urgently needing solutions in industry but not yet fully addressed by academia
-
-        2. Application Innovation Points:
-           - Emerging application scenarios for recommendation systems and data mining
-           - New business models challenging traditional methods
-           - Cross-scenario, cross-modal integration application opportunities
-
-        3. Industry Pain Points:
-           - Scalability and efficiency challenges faced by existing systems
-           - Balancing dilemmas between user experience and commercial value
-           - Contradictions between privacy protection and personalized recommendations
-
-        4. Innovation Opportunities:
-           - Best entry points for industry-academia-research collaboration
-           - New directions that might disrupt existing technology stacks
-           - Data value not yet fully developed
-
-        For each trend or opportunity proposed:
-        - Explain its industry importance and innovation potential
-        - Analyze current technological maturity and commercialization progress
-        - Point out challenges that might be faced during implementation
-        - Predict commercial value that might be brought after successful application
-
-        Please focus on truly transformative trends and opportunities, avoiding directions already widely known. Your insights should inspire the PhD student to think about research directions with both academic innovation and practical application value.
+        return self.oneshot(_INDUSTRY_TRENDS_PROMPT, temperature=0.8)
+
+    def comprehensive_review(self, draft: str) -> Dict[str, str]:
+        """
+        一次请求同时完成研究计划审核、行业趋势、工程化指导和市场洞察，
+        比分别调用四个方法少三次往返，材料和系统提示词也只发送一次
+
+        合并请求的回复被截断或无法解析时，改为分别调用四个单项方法
+
+        Args:
+            draft: 博士生提交的研究计划或论文草稿
+
+        Returns:
+            包含plan_review、industry_trends、implementation_guidance、market_insight四个键的字典
         """
-        return self.get_response(prompt, temperature=0.8)
+        result = self._get_combined_response(
+            _COMPREHENSIVE_REVIEW_HEADER + draft + _COMPREHENSIVE_REVIEW_TASKS,
+            lambda reply: self._parse_json_fields(reply, _COMPREHENSIVE_REVIEW_KEYS),
+            temperature=0.7
+        )
+        if result is None:
+            result = {
+                "plan_review": self.review_research_plan(draft),
+                "industry_trends": self.suggest_industry_trends(),
+                "implementation_guidance": self.provide_implementation_guidance(draft),
+                "market_insight": self.provide_market_insight(draft),
+            }
+        return result
+
+    async def asuggest_industry_trends(self) -> str:
+        """提供行业趋势和创新机会的洞察（异步版本）"""
+        return await self.aoneshot(_INDUSTRY_TRENDS_PROMPT, temperature=0.8)
 
     def provide_implementation_guidance(self, method: str) -> str:
         """
@@ -170,41 +348,13 @@ class IndustryAdvisorAgent(BaseAgent):
         Returns:
             工程化和落地建议
         """
-        prompt = f"""
-        As an AI scientist with rich engineering practical experience, please provide detailed implementation guidance for the following research method or technology:
+        prompt = _IMPLEMENTATION_GUIDANCE_PREAMBLE + method + _IMPLEMENTATION_GUIDANCE_TRAILER
+        return self.oneshot(prompt, temperature=0.6)
 
-        Technology/Method: {method}
-
-        Please provide engineering guidance from the following perspectives:
-
-        1. System Architecture Design:
-           - Recommended overall architecture and key components
-           - Integration solutions with existing technology stacks
-           - Separation design of offline training and online serving
-
-        2. Performance Optimization Strategies:
-           - Key technologies for improving computational efficiency
-           - Optimization solutions for latency-sensitive applications
-           - Distributed deployment and load balancing considerations
-
-        3. Scaling Challenges:
-           - Strategies for scaling from laboratory to production environment
-           - Engineering solutions for large-scale data processing
-           - System resilience design for handling traffic spikes and continuous growth
-
-        4. Engineering Difficulties:
-           - Key transformation points from algorithm theory to engineering implementation
-           - Common engineering implementation pitfalls and solutions
-           - Best practices for monitoring, debugging, and continuous optimization
-
-        5. A/B Testing and Evaluation:
-           - Scientific methods for online effect evaluation
-           - Selection of key business metrics and technical indicators
-           - Best practices for experimental design and results analysis
-
-        Please provide specific, practical guidance based on battle-tested experience, helping to transform this technology from a research prototype into a reliable product-level system. Your advice should balance theoretical optimality with engineering feasibility, focusing on key decision points in the actual implementation process.
-        """
-        return self.get_response(prompt, temperature=0.6)
+    async def aprovide_implementation_guidance(self, method: str) -> str:
+        """提供实际落地和工程化指导（异步版本）"""
+        prompt = _IMPLEMENTATION_GUIDANCE_PREAMBLE + method + _IMPLEMENTATION_GUIDANCE_TRAILER
+        return await self.aoneshot(prompt, temperature=0.6)
 
     def provide_market_insight(self, technology: str) -> str:
         """
@@ -216,65 +366,62 @@ class IndustryAdvisorAgent(BaseAgent):
         Returns:
             市场洞察和商业价值分析
         """
-        prompt = f"""
-        As an AI scientist who understands both technology and markets, please provide in-depth market insights and commercial value analysis for the following technology or field:
-
-        Technology/Field: {technology}
-
-        Please analyze from the following perspectives:
-
-        1. Market Situation:
-           - Current market acceptance and demand for this technology
-           - Major players and competitive landscape
-           - Technology maturity and commercialization stage
-
-        2. Commercial Value:
-           - Direct and indirect commercial value this technology might create
-           - Application scenarios with the most commercial potential
-           - Key indicators and methods for value assessment
+        prompt = _MARKET_INSIGHT_PREAMBLE + technology + _MARKET_INSIGHT_TRAILER
+        return self.oneshot(prompt, temperature=0.7)
 
-        3. Implementation Path:
-           - Possible paths from innovation to productization
-           - Market entry strategies and timing choices
-           - Possible business models and monetization methods
+    async def aprovide_market_insight(self, technology: str) -> str:
+        """提供特定技术的市场洞察和商业价值分析（异步版本）"""
+        prompt = _MARKET_INSIGHT_PREAMBLE + technology + _MARKET_INSIGHT_TRAILER
+        return await self.aoneshot(prompt, temperature=0.7)
 
-        4. Risks and Challenges:
-           - Market risks faced in technology application
-           - User acceptance and adoption curve predictions
-           - Potential regulatory and compliance considerations
-
-        5. Development Trends:
-           - Market development predictions for the next 1-3 years
-           - Possible disruptive changes and opportunity windows
-           - Long-term value and strategic significance
-
-        Please provide analysis based on market insights and industry experience, helping to understand the commercial prospects and strategic value of this technology. Your analysis should balance optimism with reality, pointing out potential while frankly assessing challenges.
-        """
-        return self.get_response(prompt, temperature=0.7)
-
-    def answer_question(self, question: str) -> str:
+    def answer_question(self, question: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         回答博士生的问题，提供产业视角和应用洞察
 
         Args:
             question: 博士生提出的问题
+            stream: 是否以流式方式返回回答
 
         Returns:
-            产业视角回答
+            产业视角回答，stream为True时为回答片段的迭代器
         """
-        prompt = f"""
-        As the Chief AI Scientist at ByteDance, please answer the following question from the PhD student, providing deep and practically valuable guidance from an industry perspective:
+        prompt = _ANSWER_QUESTION_PREAMBLE + question + _ANSWER_QUESTION_TRAILER
+        if stream:
+            return self._stream_answer_question(prompt)
 
-        {question}
+        response = self.get_response(prompt, temperature=0.7)
+        return f"[企业导师回复] {response}"
+
+    def _stream_answer_question(self, prompt: str) -> Iterator[str]:
+        """流式回答问题，回复标签随第一个片段立即产出"""
+        tagged = False
+        for chunk in self.stream_response(prompt, temperature=0.7):
+            if not tagged:
+                tagged = True
+                yield f"[企业导师回复] {chunk}"
+            else:
+                yield chunk
+
+    async def aanswer_question(self, question: str) -> str:
+        """回答博士生的问题，提供产业视角和应用洞察（异步版本）"""
+        prompt = _ANSWER_QUESTION_PREAMBLE + question + _ANSWER_QUESTION_TRAILER
+        response = await self.aget_response(prompt, temperature=0.7)
+        return f"[企业导师回复] {response}"
+
+    def answer_questions(self, questions: List[str]) -> List[str]:
+        """
+        在一次请求中回答博士生的多个互不依赖的问题
 
-        Your answer should:
-        - Incorporate actual industry experience and cutting-edge cases
-        - Share the latest developments and internal perspectives from industry
-        - Balance theoretical perfection with engineering practicality
-        - Provide specific implementation ideas and engineering suggestions
-        - Highlight connections and gaps between academic research and industry needs
+        Args:
+            questions: 博士生提出的问题列表
 
-        Don't limit yourself to published research or public information; provide deep insights based on real industry experience. Your goal is to help the PhD student understand how to transform research into innovations that create actual value.
+        Returns:
+            与问题顺序一致、带回复标签的回答列表
         """
-        response = self.get_response(prompt, temperature=0.7)
-        return f"[企业导师回复] {response}"
\ No newline at end of file
+        answers = self._answer_batched(_ANSWER_QUESTION_PREAMBLE, questions, _ANSWER_QUESTION_TRAILER)
+        return [f"[企业导师回复] {answer}" for answer in answers]
+
+    async def aanswer_questions(self, questions: List[str]) -> List[str]:
+        """在一次请求中回答博士生的多个互不依赖的问题（异步版本）"""
+        answers = await self._aanswer_batched(_ANSWER_QUESTION_PREAMBLE, questions, _ANSWER_QUESTION_TRAILER)
+        return [f"[企业导师回复] {answer}" for answer in answers]
@@ -1,68 +1,254 @@
-from agents.base_agent import BaseAgent
+import asyncio
+import re
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from agents.base_agent import BaseAgent, run_async
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+# 为博士生定义系统提示词，强化学术严谨性和深度
+_SYSTEM_PROMPT = """
+You are a methodical, application-oriented PhD student in artificial intelligence, focusing on the intersection of LLM-Agent and internet data mining. You possess strong academic rigor, systematic research methods, and a commitment to developing practical innovations with measurable business value.
+
+Your main task is to complete a high-quality academic paper with substantial contributions under the guidance of two advisors, which must meet the standards of top academic conferences or journals while demonstrating clear practical applications in real-world internet scenarios.
+
+Your academic advisor is an expert in the LLM-Agent field, while your industry advisor is a data mining expert from ByteDance's TikTok team who emphasizes real-world implementation and business impact.
+
+Your core academic and professional qualities:
+1. Evidence-based research approach: You always base your work on empirical evidence, real-world data, and reproducible experiments rather than theoretical speculation
+2. Application-oriented analytical ability: You can identify specific, well-defined limitations in existing systems when deployed in real-world internet environments
+3. Engineering-aware methodology: Your research follows both academic standards and engineering best practices, ensuring your methods can scale to production environments
+4. Data-driven critical thinking: You evaluate methods based on their performance on large-scale, real-world datasets and their ability to solve actual business problems
+5. Implementation-focused writing: You present complex ideas with clear technical details, system architectures, and implementation considerations
+
+In your research process, you must:
+- Identify specific, well-defined research gaps based on analysis of real-world internet data mining challenges
+- Propose solutions that can be implemented in production environments with reasonable computational resources
+- Focus on methods that provide measurable improvements on business-relevant metrics
+- Design experimental protocols using real or realistic internet-scale datasets
+- Include detailed implementation considerations, system architectures, and scalability analyses
+- Validate your methods through both offline experiments and simulated online evaluations
+
+You should constantly ask yourself:
+- Does my research address a specific, well-defined problem in internet data mining?
+- Can my method be implemented in production systems with reasonable resources?
+- Have I validated my approach on datasets that reflect real-world conditions?
+- Have I quantified the business value and practical impact of my method?
+- Have I addressed implementation challenges and scalability concerns?
+- Is my paper useful for both researchers and industry practitioners?
+
+Your goal is to complete a high-quality academic paper that represents a meaningful advancement in the field through careful, methodical research with clear practical applications. Your innovations should be implementable, scalable to internet-scale data, and provide measurable business value.
+
+IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
+"""
+
+# 论文篇幅和参考文献要求只在撰写论文时需要，开启论文模式后作为前导内容放在每次的用户消息之前，
+# 构思、批判等其他请求不携带这部分内容
+_PAPER_REQUIREMENTS = """Requirements for the paper you are writing:
+- At least 10,000 words of substantial content (excluding references)
+- Complete related work review (at least 2,000 words) with special attention to industry-deployed methods
+- Detailed methodology description (at least 3,000 words) including system architecture and implementation details
+- Comprehensive experimental design and results analysis (at least 3,000 words) using real-world or realistic datasets
+- Specific business value analysis (at least 1,000 words) quantifying potential impact on key performance indicators
+- Implementation and deployment considerations (at least 1,000 words) addressing engineering challenges
+- In-depth discussion and future work outlook (at least 1,500 words) with clear industry applications
+- At least 30 high-quality references, including both academic papers and industry technical reports
+
+"""
+
+# 固定参考文献附在系统提示词之后，成为每次请求相同的前缀，由API的前缀缓存复用
+_REFERENCE_CORPUS_HEADER = """
+Reference literature (a fixed paper collection for this project; when citing work, prefer papers from this collection and cite them accurately):
+
+"""
+
+# 各方法的提示词前缀（不含行首缩进）。可变内容统一拼接在末尾，保证前缀逐字节不变以命中前缀缓存
+_BRAINSTORM_PREFIX = """
+As a PhD student focused on practical applications, please conduct a methodical, evidence-based analysis on the research direction in internet data mining given right after these instructions, focusing on innovations with clear business value:
+
+Please first systematically analyze:
+1. Current industry practices and deployed systems in this field (cite specific company implementations where possible)
+2. Research progress and production-ready methods developed in the past 3 years (cite at least 10 relevant papers with industry validation)
+3. Performance benchmarks and metrics used to evaluate these methods on real-world internet-scale datasets
+4. Specific limitations of existing methods when deployed in production environments (with concrete evidence from industry reports or papers)
+5. Well-defined unsolved problems and engineering challenges that impact business metrics in real-world applications
+6. Available internet datasets, APIs, and tools that can be leveraged for research in this area
+
+Based on the above thorough analysis, propose 1-2 feasible research directions that address real business needs. For each direction:
+- Clearly define a focused, well-scoped research problem with demonstrable business value and quantifiable metrics
+- Establish a solid technical foundation based on methods proven to work at scale in production environments
+- Provide detailed explanation of how your approach addresses specific limitations in real-world deployments
+- Design a practical technical approach that can be implemented with reasonable computational resources, including:
+  * Detailed system architecture with components and data flows
+  * Specific algorithms with pseudocode or implementation considerations
+  * Data processing pipelines and efficiency optimizations
+  * Scaling strategies for internet-scale deployment
+- Formulate verifiable research hypotheses and evaluation protocols using realistic datasets and workloads
+- Analyze potential implementation challenges and provide concrete engineering solutions
+- Estimate the potential business impact with specific KPIs and metrics
+
+Your analysis must be firmly grounded in practical implementation considerations and real-world constraints. Avoid approaches that cannot reasonably scale to production environments or that require unrealistic computational resources. Each proposed innovation should represent a clear improvement on existing deployed systems with well-defined, measurable business value.
+
+Please write in a rigorous academic paper style that also addresses practical implementation concerns. Balance theoretical soundness with engineering feasibility, focusing on innovations that can be realistically deployed in production internet systems and that provide measurable improvements on business-relevant metrics.
+"""
+
+_CRITIQUE_PREFIX = """
+As a PhD student with both academic training and industry awareness, please conduct a practical, evidence-based analysis of the existing methods given right after these instructions, focusing on their real-world deployment limitations in internet data mining contexts:
+
+Please analyze according to the following application-oriented framework:
+
+1. Production Readiness Analysis
+   - Evaluate the methods' scalability to internet-scale data volumes (billions of items/users)
+   - Analyze computational and memory requirements in production environments
+   - Identify concrete limitations when deployed on standard cloud infrastructure
+   - Assess latency and throughput characteristics for real-time applications
+   - Cite relevant industry deployments or technical reports (at least 5 sources)
+
+2. Engineering Implementation Analysis
+   - Evaluate the complexity of implementation and maintenance in production systems
+   - Analyze dependencies on specialized hardware or software frameworks
+   - Discuss specific failure modes and error handling capabilities
+   - Identify well-documented engineering challenges from industry practitioners
+   - Assess code quality, modularity, and integration capabilities with existing systems
+
+3. Data Requirements and Quality Analysis
+   - Evaluate data preprocessing needs and sensitivity to data quality issues
+   - Analyze performance degradation with incomplete, noisy, or biased internet data
+   - Discuss specific data privacy and security implications
+   - Identify data collection and annotation requirements and associated costs
+   - Assess performance on publicly available internet datasets versus proprietary ones
+
+4. Business Value and ROI Analysis
+   - Evaluate documented business impact metrics from actual deployments
+   - Analyze implementation and operational costs versus performance gains
+   - Discuss concrete A/B testing results and statistical significance in real applications
+   - Identify specific gaps between academic performance claims and business outcomes
+   - Assess time-to-market and development resource requirements
+
+5. Monitoring and Maintenance Analysis
+   - Evaluate model drift detection and retraining requirements
+   - Analyze debugging capabilities and interpretability for engineering teams
+   - Discuss specific monitoring metrics and alerting strategies
+   - Identify documented maintenance burdens and operational challenges
+   - Assess documentation quality and knowledge transfer requirements
+
+For each analysis dimension, please:
+- Base arguments on documented evidence from industry deployments or technical reports
+- Provide specific, quantifiable metrics rather than general observations
+- Cite relevant industry case studies that demonstrate the specific limitations
+- Propose practical, implementable improvements that address real-world deployment challenges
+
+Please maintain a balanced perspective that acknowledges both theoretical strengths and practical limitations. Focus on specific, addressable engineering and business issues rather than academic criticisms. Your analysis should identify concrete opportunities for making these methods more viable in production internet systems.
+"""
+
+_SYNTH_PREFIX = """
+As a PhD student focused on practical internet applications, please conduct a focused, evidence-based analysis of how to integrate the domains given right after these instructions to solve real internet data mining challenges, emphasizing industry-validated approaches and business value:
+
+Please analyze according to the following application-oriented framework:
+
+1. Analysis of Industry-Validated Cross-Domain Applications (at least 1500 words)
+   - Review documented case studies of successful domain integration in major internet companies
+   - Analyze specific technical implementations that have been deployed in production systems
+   - Identify concrete business metrics improvements achieved through domain integration
+   - Cite technical reports, engineering blogs, and conference papers from industry (at least 10 sources)
+   - Provide examples of open-source tools and frameworks that facilitate this integration
+
+2. Analysis of Internet-Scale Data Processing Approaches (at least 1500 words)
+   - Analyze how each domain handles large-scale internet data processing challenges
+   - Evaluate specific system architectures and data pipelines used in production environments
+   - Identify documented examples of performance optimizations and scaling strategies
+   - Discuss practical implementation considerations for processing internet-scale data
+   - Compare cloud-based versus on-premise deployment approaches for integrated systems
+
+3. Examination of Shared Business Challenges in Internet Applications (at least 1500 words)
+   - Analyze specific internet business problems that both domains are addressing
+   - Evaluate documented ROI and business impact metrics from integrated approaches
+   - Identify concrete problem areas where combined approaches have shown measurable value
+   - Discuss practical challenges in implementing and maintaining integrated systems
+   - Analyze how these integrated approaches affect key internet business metrics
+
+4. Focused Internet Application Development Proposals (at least 2000 words)
+   - Propose 1-2 well-defined, practical integrated systems for internet data mining challenges
+   - For each proposal, elaborate in detail:
+     * Specific business problem and target KPIs in internet applications
+     * System architecture with detailed components, data flows, and integration points
+     * Implementation plan with technology stack, frameworks, and APIs
+     * Scaling strategy for handling internet-scale data volumes
+     * Performance optimization techniques and resource requirements
+     * Monitoring, maintenance, and update strategies
+     * Expected business impact with quantifiable metrics
+     * Deployment timeline and resource requirements
+     * Potential challenges and mitigation strategies
+
+Your analysis must:
+- Be based on documented evidence from industry implementations and technical reports
+- Focus on practical, deployable integration opportunities with clear business value
+- Cite relevant industry case studies demonstrating successful implementations
+- Include specific technical details, system designs, and implementation considerations
+- Address real-world constraints like computational efficiency, latency requirements, and cost considerations
+
+Please write in a clear, structured style that balances academic rigor with practical implementation details. Your goal is to propose integrated approaches that can be realistically implemented in production internet systems and provide measurable business value, supported by evidence from existing industry applications.
+"""
+
+# 按空行切分段落并筛选含关键词的段落，一次正则扫描完成，段落边界与split("\n\n")一致
+_PARAGRAPH_BODY = r"(?:[^\n]|\n(?!\n))*"
+_INNOVATION_RE = re.compile(
+    rf"(?:^|(?<=\n\n))({_PARAGRAPH_BODY}?(?:研究方向|创新点){_PARAGRAPH_BODY})"
+)
+_CHALLENGE_RE = re.compile(
+    rf"(?:^|(?<=\n\n))({_PARAGRAPH_BODY}?(?:局限性|问题|挑战|分析){_PARAGRAPH_BODY})"
+)
+
+# full_analysis将三项分析合并为一次请求，要求模型以JSON对象返回各项结果
+_FULL_ANALYSIS_KEYS = ("innovations", "critique", "synthesis")
+_FULL_ANALYSIS_HEADER = """
+Complete the three tasks below in a single response.
+
+Task 1 (innovations):"""
+_FULL_ANALYSIS_CRITIQUE = """
+Task 2 (critique):"""
+_FULL_ANALYSIS_SYNTHESIS = """
+Task 3 (synthesis):"""
+_FULL_ANALYSIS_FOOTER = """
+Return JSON with keys "innovations", "critique", "synthesis"; each value is the complete answer to that task as a Markdown string written in Simplified Chinese.
+"""
+
+# 导师类型对应的提问标签，未知类型按企业导师处理
+_ASK_PREFIXES = {"academic": "[博士生向高校导师提问] ", "industry": "[博士生向企业导师提问] "}
+
 
 class PhDStudentAgent(BaseAgent):
     """
     模拟一位人工智能专业的博士研究生，研究方向为LLM-Agent与数据挖掘的交叉领域
     加强创新思维和批判性思考能力
     """
-    def __init__(self):
-        # 为博士生定义系统提示词，强化学术严谨性和深度
-        system_prompt = """
-        You are a methodical, application-oriented PhD student in artificial intelligence, focusing on the intersection of LLM-Agent and internet data mining. You possess strong academic rigor, systematic research methods, and a commitment to developing practical innovations with measurable business value.
-
-        Your main task is to complete a high-quality academic paper with substantial contributions under the guidance of two advisors, which must meet the standards of top academic conferences or journals while demonstrating clear practical applications in real-world internet scenarios.
-
-        Your academic advisor is an expert in the LLM-Agent field, while your industry advisor is a data mining expert from ByteDance's TikTok team who emphasizes real-world implementation and business impact.
-
-        Your core academic and professional qualities:
-        1. Evidence-based research approach: You always base your work on empirical evidence, real-world data, and reproducible experiments rather than theoretical speculation
-        2. Application-oriented analytical ability: You can identify specific, well-defined limitations in existing systems when deployed in real-world internet environments
-        3. Engineering-aware methodology: Your research follows both academic standards and engineering best practices, ensuring your methods can scale to production environments
-        4. Data-driven critical thinking: You evaluate methods based on their performance on large-scale, real-world datasets and their ability to solve actual business problems
-        5. Implementation-focused writing: You present complex ideas with clear technical details, system architectures, and implementation considerations
-
-        In your research process, you must:
-        - Identify specific, well-defined research gaps based on analysis of real-world internet data mining challenges
-        - Propose solutions that can be implemented in production environments with reasonable computational resources
-        - Focus on methods that provide measurable improvements on business-relevant metrics
-        - Design experimental protocols using real or realistic internet-scale datasets
-        - Include detailed implementation considerations, system architectures, and scalability analyses
-        - Validate your methods through both offline experiments and simulated online evaluations
-
-        Your paper must include:
-        - At least 10,000 words of substantial content (excluding references)
-        - Complete related work review (at least 2,000 words) with special attention to industry-deployed methods
-        - Detailed methodology description (at least 3,000 words) including system architecture and implementation details
-        - Comprehensive experimental design and results analysis (at least 3,000 words) using real-world or realistic datasets
-        - Specific business value analysis (at least 1,000 words) quantifying potential impact on key performance indicators
-        - Implementation and deployment considerations (at least 1,000 words) addressing engineering challenges
-        - In-depth discussion and future work outlook (at least 1,500 words) with clear industry applications
-        - At least 30 high-quality references, including both academic papers and industry technical reports
-
-        You should constantly ask yourself:
-        - Does my research address a specific, well-defined problem in internet data mining?
-        - Can my method be implemented in production systems with reasonable resources?
-        - Have I validated my approach on datasets that reflect real-world conditions?
-        - Have I quantified the business value and practical impact of my method?
-        - Have I addressed implementation challenges and scalability concerns?
-        - Is my paper useful for both researchers and industry practitioners?
-
-        Your goal is to complete a high-quality academic paper that represents a meaningful advancement in the field through careful, methodical research with clear practical applications. Your innovations should be implementable, scalable to internet-scale data, and provide measurable business value.
-
-        IMPORTANT: While all instructions are in English, you must ALWAYS respond in Simplified Chinese.
+    MAX_TRACKED_POINTS = 128  # 创新点和研究挑战各自最多保留的条数，超出后丢弃最早的条目
+
+    def __init__(self, memory_dir: Optional[str] = None, reference_corpus: Optional[str] = None):
         """
+        初始化博士生Agent
 
+        Args:
+            memory_dir: 可选的长期记忆持久化目录
+            reference_corpus: 可选的固定参考文献文本，附加在系统提示词之后，
+                整个会话中不再变化，重复请求时可从API的前缀缓存中读取而不是重新计算
+        """
+        system_prompt = _SYSTEM_PROMPT
+        if reference_corpus:
+            system_prompt = _SYSTEM_PROMPT + _REFERENCE_CORPUS_HEADER + reference_corpus
         super().__init__(
             role="博士生",
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            memory_dir=memory_dir
         )
 
         # 博士生特有的属性
         self.research_topic = None  # 研究主题
         self.research_plan = None   # 研究计划
-        self.paper_draft = None     # 论文草稿
-        self.innovation_points = [] # 创新点列表
-        self.research_challenges = [] # 研究挑战列表
+        self._paper_draft_z: Optional[bytes] = None  # zlib压缩后的论文草稿，通过paper_draft属性读写
+        self.innovation_points = deque(maxlen=self.MAX_TRACKED_POINTS)   # 创新点（只保留最近的若干条）
+        self.research_challenges = deque(maxlen=self.MAX_TRACKED_POINTS) # 研究挑战（只保留最近的若干条）
+        self.paper_mode = False     # 是否在撰写论文内容，开启后请求附带论文篇幅要求
 
     def set_research_topic(self, topic: str) -> None:
         """设置研究主题"""
@@ -72,10 +258,41 @@ class PhDStudentAgent(BaseAgent):
         """设置研究计划"""
         self.research_plan = plan
 
+    @property
+    def paper_draft(self) -> Optional[str]:
+        """论文草稿（以压缩形式保存，读取时解压）"""
+        if self._paper_draft_z is None:
+            return None
+        return zlib.decompress(self._paper_draft_z).decode("utf-8")
+
+    @paper_draft.setter
+    def paper_draft(self, draft: Optional[str]) -> None:
+        self._paper_draft_z = zlib.compress(draft.encode("utf-8")) if draft is not None else None
+
     def update_paper_draft(self, draft: str) -> None:
         """更新论文草稿"""
         self.paper_draft = draft
 
+    def set_paper_mode(self, enabled: bool) -> None:
+        """设置是否处于论文撰写阶段，开启后每次请求都附带论文篇幅和参考文献要求"""
+        self.paper_mode = enabled
+
+    @contextmanager
+    def paper_mode_enabled(self) -> Iterator[None]:
+        """仅在with块内开启论文模式，退出时（包括发生异常时）恢复原来的设置"""
+        previous = self.paper_mode
+        self.paper_mode = True
+        try:
+            yield
+        finally:
+            self.paper_mode = previous
+
+    def _prepare_messages(self, message: str) -> List[Dict[str, str]]:
+        """论文模式下在用户消息前附加论文要求，要求只随请求发送，不写入对话历史"""
+        if self.paper_mode:
+            message = _PAPER_REQUIREMENTS + message
+        return super()._prepare_messages(message)
+
     def add_innovation_point(self, point: str) -> None:
         """添加创新点"""
         self.innovation_points.append(point)
@@ -84,56 +301,96 @@ class PhDStudentAgent(BaseAgent):
         """添加研究挑战"""
         self.research_challenges.append(challenge)
 
-    def brainstorm_innovations(self, context: str) -> str:
+    def brainstorm_innovations(self, context: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         进行基于文献和理论的创新思考
 
         Args:
             context: 当前研究上下文
+            stream: 是否以流式方式返回，流式时每个段落生成完毕即提取其中的创新点
 
         Returns:
-            基于文献的创新思考
-        """
-        prompt = f"""
-        As a PhD student focused on practical applications, please conduct a methodical, evidence-based analysis on the following research direction in internet data mining, focusing on innovations with clear business value:
-
-        Research context: {context}
-
-        Please first systematically analyze:
-        1. Current industry practices and deployed systems in this field (cite specific company implementations where possible)
-        2. Research progress and production-ready methods developed in the past 3 years (cite at least 10 relevant papers with industry validation)
-        3. Performance benchmarks and metrics used to evaluate these methods on real-world internet-scale datasets
-        4. Specific limitations of existing methods when deployed in production environments (with concrete evidence from industry reports or papers)
-        5. Well-defined unsolved problems and engineering challenges that impact business metrics in real-world applications
-        6. Available internet datasets, APIs, and tools that can be leveraged for research in this area
-
-        Based on the above thorough analysis, propose 1-2 feasible research directions that address real business needs. For each direction:
-        - Clearly define a focused, well-scoped research problem with demonstrable business value and quantifiable metrics
-        - Establish a solid technical foundation based on methods proven to work at scale in production environments
-        - Provide detailed explanation of how your approach addresses specific limitations in real-world deployments
-        - Design a practical technical approach that can be implemented with reasonable computational resources, including:
-          * Detailed system architecture with components and data flows
-          * Specific algorithms with pseudocode or implementation considerations
-          * Data processing pipelines and efficiency optimizations
-          * Scaling strategies for internet-scale deployment
-        - Formulate verifiable research hypotheses and evaluation protocols using realistic datasets and workloads
-        - Analyze potential implementation challenges and provide concrete engineering solutions
-        - Estimate the potential business impact with specific KPIs and metrics
-
-        Your analysis must be firmly grounded in practical implementation considerations and real-world constraints. Avoid approaches that cannot reasonably scale to production environments or that require unrealistic computational resources. Each proposed innovation should represent a clear improvement on existing deployed systems with well-defined, measurable business value.
-
-        Please write in a rigorous academic paper style that also addresses practical implementation concerns. Balance theoretical soundness with engineering feasibility, focusing on innovations that can be realistically deployed in production internet systems and that provide measurable improvements on business-relevant metrics.
+            基于文献的创新思考，stream为True时为回复片段的迭代器
         """
+        prompt = _BRAINSTORM_PREFIX + "\nResearch context:\n" + context
+        if stream:
+            return self._stream_brainstorm(prompt)
 
         response = self.get_response(prompt, temperature=0.7)  # 使用适中的温度平衡创新性和严谨性
 
         # 提取创新点并存储
-        for point in response.split("\n\n"):
-            if point.strip() and ("研究方向" in point or "创新点" in point):
-                self.add_innovation_point(point.strip())
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(response))
 
         return response
 
+    def _stream_brainstorm(self, prompt: str) -> Iterator[str]:
+        """流式创新思考，每出现一个空行就从已完整的段落中提取创新点"""
+        pending = ""
+        for chunk in self.stream_response(prompt, temperature=0.7):
+            pending = self._extract_streamed_innovations(pending + chunk, len(chunk))
+            yield chunk
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(pending))
+
+    def _extract_streamed_innovations(self, pending: str, chunk_len: int) -> str:
+        """
+        从流式缓冲区中已完整的段落提取创新点
+
+        Args:
+            pending: 追加了新片段后的缓冲区
+            chunk_len: 新片段的长度
+
+        Returns:
+            最后一个空行之后尚未完整的部分
+        """
+        # 上一轮切分后缓冲区中已无空行，只需检查新片段及其前一个字符
+        if "\n\n" not in pending[-chunk_len - 1:]:
+            return pending
+        complete, _, pending = pending.rpartition("\n\n")
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(complete))
+        return pending
+
+    async def abrainstorm_innovations(self, context: str) -> str:
+        """进行基于文献和理论的创新思考（异步版本）"""
+        prompt = _BRAINSTORM_PREFIX + "\nResearch context:\n" + context
+        response = await self.aget_response(prompt, temperature=0.7)
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(response))
+        return response
+
+    def brainstorm_many(self, contexts: List[str]) -> List[str]:
+        """
+        对多个研究上下文并发进行创新思考
+
+        并发数受BaseAgent.MAX_CONCURRENT_REQUESTS限制
+
+        Args:
+            contexts: 研究上下文列表
+
+        Returns:
+            与输入顺序一致的创新思考列表
+        """
+        return run_async(self.abrainstorm_many(contexts))
+
+    async def abrainstorm_many(self, contexts: List[str]) -> List[str]:
+        """对多个研究上下文并发进行创新思考（异步版本）"""
+        return list(await asyncio.gather(*[self.abrainstorm_innovations(context) for context in contexts]))
+
+    async def astream_brainstorm_innovations(self, context: str) -> AsyncIterator[str]:
+        """
+        以流式方式进行创新思考（异步版本），每个段落生成完毕即提取其中的创新点
+
+        Args:
+            context: 当前研究上下文
+
+        Yields:
+            回复的文本片段
+        """
+        prompt = _BRAINSTORM_PREFIX + "\nResearch context:\n" + context
+        pending = ""
+        async for chunk in self.astream_response(prompt, temperature=0.7):
+            pending = self._extract_streamed_innovations(pending + chunk, len(chunk))
+            yield chunk
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(pending))
+
     def critique_existing_approaches(self, approaches: str) -> str:
         """
         系统性批判分析现有方法
@@ -144,64 +401,20 @@ class PhDStudentAgent(BaseAgent):
         Returns:
             系统性批判分析
         """
-        prompt = f"""
-        As a PhD student with both academic training and industry awareness, please conduct a practical, evidence-based analysis of the following existing methods, focusing on their real-world deployment limitations in internet data mining contexts:
-
-        Existing methods: {approaches}
-
-        Please analyze according to the following application-oriented framework:
-
-        1. Production Readiness Analysis
-           - Evaluate the methods' scalability to internet-scale data volumes (billions of items/users)
-           - Analyze computational and memory requirements in production environments
-           - Identify concrete limitations when deployed on standard cloud infrastructure
-           - Assess latency and throughput characteristics for real-time applications
-           - Cite relevant industry deployments or technical reports (at least 5 sources)
-
-        2. Engineering Implementation Analysis
-           - Evaluate the complexity of implementation and maintenance in production systems
-           - Analyze dependencies on specialized hardware or software frameworks
-           - Discuss specific failure modes and error handling capabilities
-           - Identify well-documented engineering challenges from industry practitioners
-           - Assess code quality, modularity, and integration capabilities with existing systems
-
-        3. Data Requirements and Quality Analysis
-           - Evaluate data preprocessing needs and sensitivity to data quality issues
-           - Analyze performance degradation with incomplete, noisy, or biased internet data
-           - Discuss specific data privacy and security implications
-           - Identify data collection and annotation requirements and associated costs
-           - Assess performance on publicly available internet datasets versus proprietary ones
-
-        4. Business Value and ROI Analysis
-           - Evaluate documented business impact metrics from actual deployments
-           - Analyze implementation and operational costs versus performance gains
-           - Discuss concrete A/B testing results and statistical significance in real applications
-           - Identify specific gaps between academic performance claims and business outcomes
-           - Assess time-to-market and development resource requirements
-
-        5. Monitoring and Maintenance Analysis
-           - Evaluate model drift detection and retraining requirements
-           - Analyze debugging capabilities and interpretability for engineering teams
-           - Discuss specific monitoring metrics and alerting strategies
-           - Identify documented maintenance burdens and operational challenges
-           - Assess documentation quality and knowledge transfer requirements
-
-        For each analysis dimension, please:
-        - Base arguments on documented evidence from industry deployments or technical reports
-        - Provide specific, quantifiable metrics rather than general observations
-        - Cite relevant industry case studies that demonstrate the specific limitations
-        - Propose practical, implementable improvements that address real-world deployment challenges
-
-        Please maintain a balanced perspective that acknowledges both theoretical strengths and practical limitations. Focus on specific, addressable engineering and business issues rather than academic criticisms. Your analysis should identify concrete opportunities for making these methods more viable in production internet systems.
-        """
+        prompt = _CRITIQUE_PREFIX + "\nExisting methods:\n" + approaches
 
         response = self.get_response(prompt, temperature=0.7)
 
         # 提取研究挑战并存储
-        for challenge in response.split("\n\n"):
-            if challenge.strip() and any(keyword in challenge for keyword in ["局限性", "问题", "挑战", "分析"]):
-                self.add_research_challenge(challenge.strip())
+        self.research_challenges.extend(m.group(1).strip() for m in _CHALLENGE_RE.finditer(response))
+
+        return response
 
+    async def acritique_existing_approaches(self, approaches: str) -> str:
+        """系统性批判分析现有方法（异步版本）"""
+        prompt = _CRITIQUE_PREFIX + "\nExisting methods:\n" + approaches
+        response = await self.aget_response(prompt, temperature=0.7)
+        self.research_challenges.extend(m.group(1).strip() for m in _CHALLENGE_RE.finditer(response))
         return response
 
     def synthesize_cross_domain_insights(self, domains: str) -> str:
@@ -214,59 +427,104 @@ class PhDStudentAgent(BaseAgent):
         Returns:
             系统性跨领域分析与研究方向
         """
-        prompt = f"""
-        As a PhD student focused on practical internet applications, please conduct a focused, evidence-based analysis of how to integrate the following domains to solve real internet data mining challenges, emphasizing industry-validated approaches and business value:
-
-        Related domains: {domains}
-
-        Please analyze according to the following application-oriented framework:
-
-        1. Analysis of Industry-Validated Cross-Domain Applications (at least 1500 words)
-           - Review documented case studies of successful domain integration in major internet companies
-           - Analyze specific technical implementations that have been deployed in production systems
-           - Identify concrete business metrics improvements achieved through domain integration
-           - Cite technical reports, engineering blogs, and conference papers from industry (at least 10 sources)
-           - Provide examples of open-source tools and frameworks that facilitate this integration
-
-        2. Analysis of Internet-Scale Data Processing Approaches (at least 1500 words)
-           - Analyze how each domain handles large-scale internet data processing challenges
-           - Evaluate specific system architectures and data pipelines used in production environments
-           - Identify documented examples of performance optimizations and scaling strategies
-           - Discuss practical implementation considerations for processing internet-scale data
-           - Compare cloud-based versus on-premise deployment approaches for integrated systems
-
-        3. Examination of Shared Business Challenges in Internet Applications (at least 1500 words)
-           - Analyze specific internet business problems that both domains are addressing
-           - Evaluate documented ROI and business impact metrics from integrated approaches
-           - Identify concrete problem areas where combined approaches have shown measurable value
-           - Discuss practical challenges in implementing and maintaining integrated systems
-           - Analyze how these integrated approaches affect key internet business metrics
-
-        4. Focused Internet Application Development Proposals (at least 2000 words)
-           - Propose 1-2 well-defined, practical integrated systems for internet data mining challenges
-           - For each proposal, elaborate in detail:
-             * Specific business problem and target KPIs in internet applications
-             * System architecture with detailed components, data flows, and integration points
-             * Implementation plan with technology stack, frameworks, and APIs
-             * Scaling strategy for handling internet-scale data volumes
-             * Performance optimization techniques and resource requirements
-             * Monitoring, maintenance, and update strategies
-             * Expected business impact with quantifiable metrics
-             * Deployment timeline and resource requirements
-             * Potential challenges and mitigation strategies
-
-        Your analysis must:
-        - Be based on documented evidence from industry implementations and technical reports
-        - Focus on practical, deployable integration opportunities with clear business value
-        - Cite relevant industry case studies demonstrating successful implementations
-        - Include specific technical details, system designs, and implementation considerations
-        - Address real-world constraints like computational efficiency, latency requirements, and cost considerations
-
-        Please write in a clear, structured style that balances academic rigor with practical implementation details. Your goal is to propose integrated approaches that can be realistically implemented in production internet systems and provide measurable business value, supported by evidence from existing industry applications.
-        """
+        prompt = _SYNTH_PREFIX + "\nRelated domains:\n" + domains
 
         return self.get_response(prompt, temperature=0.7)
 
+    async def asynthesize_cross_domain_insights(self, domains: str) -> str:
+        """系统性跨领域知识整合与分析（异步版本）"""
+        prompt = _SYNTH_PREFIX + "\nRelated domains:\n" + domains
+        return await self.aget_response(prompt, temperature=0.7)
+
+    def run_round(self, context: str, approaches: str, domains: str) -> Tuple[str, str, str]:
+        """
+        并发完成一轮创新思考、现有方法批判和跨领域分析
+
+        三项分析互不依赖，并发请求时总耗时取决于最慢的一项而不是三项之和
+
+        Args:
+            context: 当前研究上下文
+            approaches: 现有方法描述
+            domains: 相关领域描述
+
+        Returns:
+            (创新思考, 批判分析, 跨领域分析)
+        """
+        return run_async(self.arun_round(context, approaches, domains))
+
+    async def arun_round(self, context: str, approaches: str, domains: str) -> Tuple[str, str, str]:
+        """并发完成一轮创新思考、现有方法批判和跨领域分析（异步版本）"""
+        brainstorm, critique, synthesis = await asyncio.gather(
+            self.abrainstorm_innovations(context),
+            self.acritique_existing_approaches(approaches),
+            self.asynthesize_cross_domain_insights(domains)
+        )
+        return brainstorm, critique, synthesis
+
+    def full_analysis(self, context: str, approaches: str, domains: str) -> Dict[str, str]:
+        """
+        一次请求同时完成创新思考、现有方法批判和跨领域分析，
+        需要两项及以上结果时比分别调用三个方法少两次往返和两次前缀计算
+
+        Args:
+            context: 当前研究上下文
+            approaches: 现有方法描述
+            domains: 相关领域描述
+
+        Returns:
+            包含innovations、critique、synthesis三个键的字典
+        """
+        result = self._get_combined_response(
+            self._full_analysis_prompt(context, approaches, domains),
+            lambda reply: self._parse_json_fields(reply, _FULL_ANALYSIS_KEYS),
+            temperature=0.7
+        )
+        if result is None:
+            # 单项方法各自提取创新点和研究挑战
+            return {
+                "innovations": self.brainstorm_innovations(context),
+                "critique": self.critique_existing_approaches(approaches),
+                "synthesis": self.synthesize_cross_domain_insights(domains),
+            }
+        self._store_full_analysis(result)
+        return result
+
+    async def afull_analysis(self, context: str, approaches: str, domains: str) -> Dict[str, str]:
+        """一次请求同时完成创新思考、现有方法批判和跨领域分析，失败时改为并发完成三项分析（异步版本）"""
+        result = await self._aget_combined_response(
+            self._full_analysis_prompt(context, approaches, domains),
+            lambda reply: self._parse_json_fields(reply, _FULL_ANALYSIS_KEYS),
+            temperature=0.7
+        )
+        if result is None:
+            innovations, critique, synthesis = await self.arun_round(context, approaches, domains)
+            return {"innovations": innovations, "critique": critique, "synthesis": synthesis}
+        self._store_full_analysis(result)
+        return result
+
+    @staticmethod
+    def _full_analysis_prompt(context: str, approaches: str, domains: str) -> str:
+        """拼接full_analysis使用的提示词，复用三个单项任务的模板"""
+        return "".join([
+            _FULL_ANALYSIS_HEADER,
+            _BRAINSTORM_PREFIX, "\nResearch context:\n", context, "\n",
+            _FULL_ANALYSIS_CRITIQUE,
+            _CRITIQUE_PREFIX, "\nExisting methods:\n", approaches, "\n",
+            _FULL_ANALYSIS_SYNTHESIS,
+            _SYNTH_PREFIX, "\nRelated domains:\n", domains, "\n",
+            _FULL_ANALYSIS_FOOTER,
+        ])
+
+    def _store_full_analysis(self, result: Dict[str, str]) -> None:
+        """
+        从full_analysis的结果中提取创新点和研究挑战
+
+        Args:
+            result: 包含三项分析结果的字典
+        """
+        self.innovation_points.extend(m.group(1).strip() for m in _INNOVATION_RE.finditer(result["innovations"]))
+        self.research_challenges.extend(m.group(1).strip() for m in _CHALLENGE_RE.finditer(result["critique"]))
+
     def ask_question(self, advisor_type: str, question: str) -> str:
         """
         记录向导师提出的问题，返回格式化的问题
@@ -278,6 +536,4 @@ class PhDStudentAgent(BaseAgent):
         Returns:
             格式化的问题
         """
-        advisor_title = "高校导师" if advisor_type == "academic" else "企业导师"
-        formatted_question = f"[博士生向{advisor_title}提问] {question}"
-        return formatted_question
\ No newline at end of file
+        return _ASK_PREFIXES.get(advisor_type, _ASK_PREFIXES["industry"]) + question
\ No newline at end of file
@@ -1,11 +1,150 @@
-from agents.phd_student import PhDStudentAgent
-from agents.academic_advisor import AcademicAdvisorAgent
-from agents.industry_advisor import IndustryAdvisorAgent
-from modules.knowledge_retrieval import KnowledgeRetrievalModule
-from modules.paper_evaluation import PaperEvaluationModule
+import asyncio
+import difflib
 import json
 import os
-from typing import Dict, Any, List, Optional
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, Awaitable, Iterable, List, Optional, Tuple, Union
+
+# 代理和模块均由调用方构造后注入，这里只在类型检查时导入，导入协调器本身不会加载OpenAI客户端等依赖
+if TYPE_CHECKING:
+    from agents.phd_student import PhDStudentAgent
+    from agents.academic_advisor import AcademicAdvisorAgent
+    from agents.industry_advisor import IndustryAdvisorAgent
+    from modules.knowledge_retrieval import KnowledgeRetrievalModule
+    from modules.paper_evaluation import PaperEvaluationModule
+
+
+async def _aanswer_in_order(
+    advisor: Union["AcademicAdvisorAgent", "IndustryAdvisorAgent"], questions: List[str]
+) -> List[str]:
+    """
+    同一位导师按顺序逐个回答问题
+
+    同一Agent的请求不并发，回答按提问顺序写入其对话历史，后一个问题也能看到前一个回答；
+    不同导师之间仍可并发
+
+    Args:
+        advisor: 导师Agent
+        questions: 按顺序提出的问题
+
+    Returns:
+        与问题顺序一致的回答列表
+    """
+    return [await advisor.aanswer_question(question) for question in questions]
+
+
+# 常见的目标会议和期刊名称（前后不能紧跟英文字母，以兼容中文上下文），允许带ACM、SIG前缀（如ACM SIGKDD）
+_VENUE_RE = re.compile(
+    r"(?<![A-Za-z])(?:ACM[\s-]*)?(?:SIG)?(NeurIPS|NIPS|ICML|ICLR|KDD|WWW|TheWebConf|The Web Conference|WebConf|"
+    r"SIGIR|CIKM|WSDM|RecSys|AAAI|IJCAI|ACL|EMNLP|NAACL|CVPR|ICCV|ECCV|TOIS|TKDE|TKDD|TPAMI|JMLR)(?![A-Za-z])"
+)
+# 会议别名统一为常用名称
+_VENUE_ALIASES = {
+    "NIPS": "NeurIPS",
+    "TheWebConf": "WWW",
+    "The Web Conference": "WWW",
+    "WebConf": "WWW",
+}
+# 未识别到已知名称时，接受形如“SIGMOD 2025”的英文名称行：以字母开头、不含中文、包含至少两个大写字母
+_VENUE_LINE_RE = re.compile(r"[A-Za-z][A-Za-z0-9 &.'-]{1,39}")
+_VENUE_LINE_PREFIX = re.compile(r"^\s*(?:\[[^\]]*\]\s*)?(?:[-*+]|\d+[.、)）])?\s*")
+# 导师建议中找不到会议或期刊名称时的目标会议，与数据挖掘方向的研究主题一致
+_DEFAULT_VENUE = "KDD"
+
+
+def _extract_first_venue(text: str) -> str:
+    """
+    从导师建议中提取最先出现的会议或期刊名称
+
+    Args:
+        text: 导师建议
+
+    Returns:
+        会议或期刊名称；导师建议中没有可识别的名称时返回默认的目标会议
+    """
+    match = _VENUE_RE.search(text)
+    if match:
+        return _VENUE_ALIASES.get(match.group(1), match.group(1))
+    for line in text.splitlines():
+        # 去掉回复标签和列表符号，跳过Markdown标题
+        line = _VENUE_LINE_PREFIX.sub("", line)
+        if line.startswith("#"):
+            continue
+        # 去掉强调标记，只取冒号、括号等说明之前的部分
+        line = re.sub(r"[*`_]", "", line)
+        line = re.split(r"[：:（(，,—]", line, maxsplit=1)[0].strip(" \t-")
+        if _VENUE_LINE_RE.fullmatch(line) and sum(c.isupper() for c in line) >= 2:
+            return line
+    return _DEFAULT_VENUE
+
+
+# 保存记录文件时使用的写缓冲区大小（字节）
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _dump_json_list(items: List[Dict[str, Any]], filename: str) -> None:
+    """
+    将记录列表逐条写入JSON数组文件
+
+    json.dump在指定indent时会退回纯Python编码器；这里逐条使用C编码器序列化并直接写入文件，
+    每条记录占一行，既不需要在内存中拼出整个文件，结果仍是合法的JSON数组
+
+    Args:
+        items: 记录列表
+        filename: 输出文件名
+    """
+    # 逐条写入的内容先在较大的缓冲区中累积，减少系统调用次数
+    with open(filename, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write("[")
+        for i, item in enumerate(items):
+            f.write(",\n  " if i else "\n  ")
+            f.write(json.dumps(item, ensure_ascii=False))
+        f.write("\n]\n" if items else "]\n")
+
+
+def _line_delta(old: str, new: str) -> List[Union[List[int], str]]:
+    """
+    计算从old到new的行级差异
+
+    差异由两类片段组成：[起始行, 结束行]表示复用old中的一段行，字符串表示新增的文本
+
+    Args:
+        old: 原文本
+        new: 新文本
+
+    Returns:
+        差异片段列表
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta: List[Union[List[int], str]] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(new_lines[j1:j2]))
+    return delta
+
+
+def _apply_line_delta(old: str, delta: List[Union[List[int], str]]) -> str:
+    """
+    将_line_delta计算出的差异应用到原文本上
+
+    Args:
+        old: 原文本
+        delta: 差异片段列表
+
+    Returns:
+        新文本
+    """
+    old_lines = old.splitlines(keepends=True)
+    return "".join(
+        "".join(old_lines[piece[0]:piece[1]]) if isinstance(piece, list) else piece
+        for piece in delta
+    )
+
 
 class AgentCoordinator:
     """
@@ -13,11 +152,12 @@ class AgentCoordinator:
     """
     def __init__(
         self,
-        phd_student: PhDStudentAgent,
-        academic_advisor: AcademicAdvisorAgent,
-        industry_advisor: IndustryAdvisorAgent,
-        knowledge_module: KnowledgeRetrievalModule,
-        evaluation_module: PaperEvaluationModule
+        phd_student: "PhDStudentAgent",
+        academic_advisor: "AcademicAdvisorAgent",
+        industry_advisor: "IndustryAdvisorAgent",
+        knowledge_module: "KnowledgeRetrievalModule",
+        evaluation_module: "PaperEvaluationModule",
+        history_log: Optional[str] = None
     ):
         """
         初始化协调器
@@ -28,6 +168,8 @@ class AgentCoordinator:
             industry_advisor: 企业导师Agent
             knowledge_module: 知识获取模块
             evaluation_module: 论文评估模块
+            history_log: 可选的交互记录文件路径，指定后每条交互记录产生时即以JSONL格式追加写入，
+                进程意外退出时已有的记录不会丢失
         """
         self.phd_student = phd_student
         self.academic_advisor = academic_advisor
@@ -39,21 +181,105 @@ class AgentCoordinator:
         self.current_phase = "initialization"  # 当前阶段
         self.interaction_history = []  # 交互历史
         self.paper_drafts = []  # 论文草稿历史
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # start_interaction期间所有阶段共用的事件循环
+
+        # 逐条追加的交互记录文件，每次运行重新开始
+        self._history_log_path = Path(history_log) if history_log else None
+        if self._history_log_path is not None:
+            self._history_log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._history_log_path.write_text("", encoding="utf-8")
 
-    def add_to_history(self, speaker: str, message: str) -> None:
+    def add_to_history(self, speaker: str, message: str, prefix: str = "") -> None:
         """
         添加交互记录到历史
 
         Args:
             speaker: 发言者
             message: 消息内容
+            prefix: 记录时加在消息前的说明文字（如"论文评估结果：\n\n"）
+        """
+        if prefix:
+            message = prefix + message
+        self._record_history(speaker, message)
+        print(f"\n[{speaker}]: {message}\n")
+
+    def add_streamed_to_history(self, speaker: str, chunks: Iterable[str], prefix: str = "") -> str:
+        """
+        边生成边打印流式回复，回复结束后将完整消息添加到历史
+
+        长篇内容（如论文各部分）不必等整段生成完毕才显示
+
+        Args:
+            speaker: 发言者
+            chunks: 回复片段的迭代器
+            prefix: 记录和打印时放在回复前的说明文字
+
+        Returns:
+            完整的回复内容（不含prefix）
         """
-        self.interaction_history.append({
+        print(f"\n[{speaker}]: {prefix}", end="", flush=True)
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            print(chunk, end="", flush=True)
+        print("\n")
+
+        reply = "".join(parts)
+        self._record_history(speaker, prefix + reply)
+        return reply
+
+    def _record_history(self, speaker: str, message: str) -> None:
+        """保存一条交互记录，指定了交互记录文件时同时追加写入文件"""
+        entry = {
             "speaker": speaker,
             "message": message,
             "phase": self.current_phase
-        })
-        print(f"\n[{speaker}]: {message}\n")
+        }
+        self.interaction_history.append(entry)
+        if self._history_log_path is not None:
+            with self._history_log_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _add_paper_draft(self, version: int, content: str) -> None:
+        """
+        保存一个论文版本
+
+        第一个版本保存全文；之后的版本相对上一版本计算行级差异，差异比全文小时只保存差异，
+        否则（例如整篇重写）仍保存全文
+
+        Args:
+            version: 版本号
+            content: 论文全文
+        """
+        entry = {"version": version, "content": content, "phase": self.current_phase}
+        if self.paper_drafts:
+            previous = self.paper_drafts[-1]
+            delta = _line_delta(self.get_draft(previous["version"]), content)
+            if len(json.dumps(delta, ensure_ascii=False)) < len(content):
+                entry = {
+                    "version": version,
+                    "diff_against": previous["version"],
+                    "delta": delta,
+                    "phase": self.current_phase
+                }
+        self.paper_drafts.append(entry)
+
+    def get_draft(self, version: int) -> str:
+        """
+        获取指定版本的论文全文
+
+        Args:
+            version: 版本号
+
+        Returns:
+            论文全文
+        """
+        for draft in self.paper_drafts:
+            if draft["version"] == version:
+                if "content" in draft:
+                    return draft["content"]
+                return _apply_line_delta(self.get_draft(draft["diff_against"]), draft["delta"])
+        raise KeyError(f"不存在版本{version}的论文草稿")
 
     def start_interaction(self) -> None:
         """
@@ -61,28 +287,74 @@ class AgentCoordinator:
         """
         print("\n===== 多Agent博士生指导系统启动 =====\n")
 
-        # 初始化阶段
-        self.current_phase = "initialization"
-        self._initialization_phase()
+        # 所有阶段共用一个事件循环，共享的异步客户端及其连接池在整个交互过程中只创建一次
+        self._loop = asyncio.new_event_loop()
+        try:
+            # 初始化阶段
+            self.current_phase = "initialization"
+            self._initialization_phase()
 
-        # 研究执行阶段
-        self.current_phase = "research_execution"
-        self._research_execution_phase()
+            # 研究执行阶段
+            self.current_phase = "research_execution"
+            self._research_execution_phase()
 
-        # 论文撰写阶段
-        self.current_phase = "paper_writing"
-        self._paper_writing_phase()
+            # 论文撰写阶段
+            self.current_phase = "paper_writing"
+            self._paper_writing_phase()
 
-        # 论文优化阶段
-        self.current_phase = "paper_optimization"
-        self._paper_optimization_phase()
+            # 论文优化阶段
+            self.current_phase = "paper_optimization"
+            self._paper_optimization_phase()
 
-        # 定稿发表阶段
-        self.current_phase = "paper_finalization"
-        self._paper_finalization_phase()
+            # 定稿发表阶段
+            self.current_phase = "paper_finalization"
+            self._paper_finalization_phase()
+        finally:
+            self._close_loop()
+            self._flush_background_work()
 
         print("\n===== 系统交互完成 =====\n")
 
+    def _close_loop(self) -> None:
+        """关闭共用的事件循环，关闭前先释放其中创建的异步客户端和线程池"""
+        from agents.base_agent import aclose_shared_async_client
+
+        loop, self._loop = self._loop, None
+        try:
+            loop.run_until_complete(aclose_shared_async_client())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+
+    def _flush_background_work(self) -> None:
+        """等待各Agent的后台对话压缩完成，保存记录前调用，保证保存的是压缩完成后的状态"""
+        from agents.base_agent import BaseAgent
+
+        BaseAgent.flush_compaction()
+
+    def _run_concurrently(self, *calls: Awaitable[Any]) -> List[Any]:
+        """
+        并发执行互不依赖的Agent异步调用，按传入顺序返回结果
+
+        各阶段的流程仍按顺序推进，只有没有数据依赖的调用（如两位导师分别审阅同一份材料）并发执行，
+        总耗时取决于最慢的一个调用而不是全部调用之和。start_interaction期间在共用的事件循环中执行；
+        单独调用某个阶段时使用临时事件循环，结束前关闭其中创建的异步客户端
+
+        Args:
+            calls: Agent异步方法返回的协程
+
+        Returns:
+            与传入顺序一致的结果列表
+        """
+        from agents.base_agent import run_async
+
+        async def gather_all() -> List[Any]:
+            return list(await asyncio.gather(*calls))
+        if self._loop is not None:
+            return self._loop.run_until_complete(gather_all())
+        return run_async(gather_all())
+
     def _initialization_phase(self) -> None:
         """
         初始化阶段的交互流程
@@ -90,17 +362,19 @@ class AgentCoordinator:
         print("\n----- 初始化阶段开始 -----\n")
 
         # 博士生提出初步研究方向
-        initial_topic = self.phd_student.get_response(
-            "作为一名人工智能专业的博士生，我需要确定一个研究方向。请思考一个在LLM-Agent与互联网内容挖掘交叉领域的有价值研究方向，特别关注实际应用场景和可量化的业务价值。研究方向应该解决互联网内容平台（如抖音）面临的实际数据挖掘挑战，并能够产生明确的业务指标改进。"
+        initial_topic = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(
+                "作为一名人工智能专业的博士生，我需要确定一个研究方向。请思考一个在LLM-Agent与互联网内容挖掘交叉领域的有价值研究方向，特别关注实际应用场景和可量化的业务价值。研究方向应该解决互联网内容平台（如抖音）面临的实际数据挖掘挑战，并能够产生明确的业务指标改进。"
+            )
         )
-        self.add_to_history("博士生", initial_topic)
 
-        # 高校导师提供学术建议
-        academic_feedback = self.academic_advisor.answer_question(initial_topic)
+        # 高校导师提供学术建议，企业导师提供产业视角建议（两位导师并发回答）
+        academic_feedback, industry_feedback = self._run_concurrently(
+            self.academic_advisor.aanswer_question(initial_topic),
+            self.industry_advisor.aanswer_question(initial_topic)
+        )
         self.add_to_history("高校导师", academic_feedback)
-
-        # 企业导师提供产业视角建议
-        industry_feedback = self.industry_advisor.answer_question(initial_topic)
         self.add_to_history("企业导师", industry_feedback)
 
         # 博士生整合反馈，确定研究方向
@@ -122,8 +396,10 @@ class AgentCoordinator:
         请提出一个具体、聚焦的研究方向，而不是泛泛而谈。研究方向应包含明确的问题定义、技术路线、预期贡献和业务价值。
         """
 
-        final_direction = self.phd_student.get_response(direction_prompt)
-        self.add_to_history("博士生", final_direction)
+        final_direction = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(direction_prompt)
+        )
 
         # 保存研究方向
         self.phd_student.set_research_topic(final_direction)
@@ -172,18 +448,21 @@ class AgentCoordinator:
         请尽可能详细地描述每个部分，确保研究计划既有学术严谨性，又有明确的工程实现路径和业务价值。
         """
 
-        research_plan = self.phd_student.get_response(research_plan_prompt)
-        self.add_to_history("博士生", f"我的研究计划如下：\n\n{research_plan}")
+        research_plan = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(research_plan_prompt),
+            prefix="我的研究计划如下：\n\n"
+        )
 
         # 保存研究计划
         self.phd_student.set_research_plan(research_plan)
 
-        # 高校导师审核研究计划
-        academic_review = self.academic_advisor.review_research_plan(research_plan)
+        # 高校导师和企业导师并发审核研究计划
+        academic_review, industry_review = self._run_concurrently(
+            self.academic_advisor.areview_research_plan(research_plan),
+            self.industry_advisor.areview_research_plan(research_plan)
+        )
         self.add_to_history("高校导师", academic_review)
-
-        # 企业导师审核研究计划
-        industry_review = self.industry_advisor.review_research_plan(research_plan)
         self.add_to_history("企业导师", industry_review)
 
         # 博士生根据反馈调整研究计划
@@ -207,8 +486,11 @@ class AgentCoordinator:
         请确保修改后的研究计划既满足学术严谨性要求，又具有明确的工程实现路径和业务价值。对每个修改点，请明确说明如何回应导师的具体建议。
         """
 
-        revised_plan = self.phd_student.get_response(plan_revision_prompt)
-        self.add_to_history("博士生", f"我修改后的研究计划：\n\n{revised_plan}")
+        revised_plan = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(plan_revision_prompt),
+            prefix="我修改后的研究计划：\n\n"
+        )
 
         # 更新研究计划
         self.phd_student.set_research_plan(revised_plan)
@@ -219,19 +501,26 @@ class AgentCoordinator:
         研究计划: {self.phd_student.research_plan}
         """
 
-        # 博士生总结
-        phd_summary = self.phd_student.summarize_phase("initialization", phase_context)
-        self.add_to_history("系统", f"[博士生阶段总结] {phd_summary}")
+        self._summarize_phase_concurrently("initialization", phase_context)
 
-        # 高校导师总结
-        academic_summary = self.academic_advisor.summarize_phase("initialization", phase_context)
-        self.add_to_history("系统", f"[高校导师阶段总结] {academic_summary}")
+        print("\n----- 初始化阶段完成 -----\n")
 
-        # 企业导师总结
-        industry_summary = self.industry_advisor.summarize_phase("initialization", phase_context)
-        self.add_to_history("系统", f"[企业导师阶段总结] {industry_summary}")
+    def _summarize_phase_concurrently(self, phase: str, phase_context: str) -> None:
+        """
+        三个代理并发总结当前阶段并存储为各自的长期记忆，总结按博士生、高校导师、企业导师的顺序记录
 
-        print("\n----- 初始化阶段完成 -----\n")
+        Args:
+            phase: 阶段名称
+            phase_context: 阶段上下文信息
+        """
+        phd_summary, academic_summary, industry_summary = self._run_concurrently(
+            self.phd_student.asummarize_phase(phase, phase_context),
+            self.academic_advisor.asummarize_phase(phase, phase_context),
+            self.industry_advisor.asummarize_phase(phase, phase_context)
+        )
+        self.add_to_history("系统", phd_summary, prefix="[博士生阶段总结] ")
+        self.add_to_history("系统", academic_summary, prefix="[高校导师阶段总结] ")
+        self.add_to_history("系统", industry_summary, prefix="[企业导师阶段总结] ")
 
     def _research_execution_phase(self) -> None:
         """
@@ -242,57 +531,54 @@ class AgentCoordinator:
         # 博士生进行文献调研
         literature_query = f"基于我的研究方向: {self.phd_student.research_topic}，请推荐相关的高水平论文"
 
-        self.add_to_history("博士生", f"我需要检索与我研究方向相关的文献: {literature_query}")
+        # 博士生利用LLM获取更多专业知识
+        knowledge_query = "在LLM-Agent与数据挖掘结合的场景中，有哪些关键技术挑战和最新解决方案？"
 
-        literature_results = self.knowledge_module.search_papers(literature_query)
+        # 文献检索与专业知识咨询互不依赖；知识获取模块只有同步接口，放到工作线程中并发执行
+        literature_results, knowledge_response = self._run_concurrently(
+            asyncio.to_thread(self.knowledge_module.search_papers, literature_query),
+            asyncio.to_thread(self.knowledge_module.consult_llm, knowledge_query)
+        )
+
+        self.add_to_history("博士生", f"我需要检索与我研究方向相关的文献: {literature_query}")
         self.add_to_history("知识获取模块", f"文献检索结果:\n\n{literature_results}")
+        self.add_to_history("博士生", f"我想咨询一下专业知识: {knowledge_query}")
+        # 直接添加回答到历史
+        self.add_to_history("知识获取模块", knowledge_response, prefix="回答: ")
 
-        # 博士生咨询高校导师关于文献的问题
+        # 博士生向高校导师请教文献和研究方法，向企业导师请教实际应用和技术实现
         literature_question = self.phd_student.ask_question(
             "academic",
             f"基于检索到的文献，我想请教一下这些论文中的方法论和理论框架是否适合我的研究方向？有哪些值得借鉴的点？"
         )
-        self.add_to_history("博士生", literature_question)
-
-        academic_literature_advice = self.academic_advisor.answer_question(literature_question)
-        self.add_to_history("高校导师", academic_literature_advice)
-
-        # 博士生咨询企业导师关于实际应用的问题
-        application_question = self.phd_student.ask_question(
-            "industry",
-            f"在抖音的实际业务场景中，这些论文中的方法是否有实际应用价值？存在哪些实际落地的挑战？"
-        )
-        self.add_to_history("博士生", application_question)
-
-        industry_application_advice = self.industry_advisor.answer_question(application_question)
-        self.add_to_history("企业导师", industry_application_advice)
-
-        # 博士生利用LLM获取更多专业知识
-        knowledge_query = "在LLM-Agent与数据挖掘结合的场景中，有哪些关键技术挑战和最新解决方案？"
-        self.add_to_history("博士生", f"我想咨询一下专业知识: {knowledge_query}")
-
-        knowledge_response = self.knowledge_module.consult_llm(knowledge_query)
-        # 直接添加回答到历史
-        self.add_to_history("知识获取模块", f"回答: {knowledge_response}")
-
-        # 博士生提出研究方法问题
         method_question = self.phd_student.ask_question(
             "academic",
             "基于我的研究方向和文献调研，我计划采用以下研究方法。这种方法是否合适？有哪些需要注意的地方？"
         )
-        self.add_to_history("博士生", method_question)
-
-        academic_method_advice = self.academic_advisor.answer_question(method_question)
-        self.add_to_history("高校导师", academic_method_advice)
-
-        # 博士生提出技术实现问题
+        application_question = self.phd_student.ask_question(
+            "industry",
+            f"在抖音的实际业务场景中，这些论文中的方法是否有实际应用价值？存在哪些实际落地的挑战？"
+        )
         implementation_question = self.phd_student.ask_question(
             "industry",
             "对于我的研究方向，在实际工程实现时可能面临哪些技术挑战？有什么建议可以帮助我克服这些挑战？"
         )
-        self.add_to_history("博士生", implementation_question)
 
-        industry_implementation_advice = self.industry_advisor.answer_question(implementation_question)
+        # 每位导师在一次请求中回答自己的两个问题，两位导师并发回答
+        academic_answers, industry_answers = self._run_concurrently(
+            self.academic_advisor.aanswer_questions([literature_question, method_question]),
+            self.industry_advisor.aanswer_questions([application_question, implementation_question])
+        )
+        academic_literature_advice, academic_method_advice = academic_answers
+        industry_application_advice, industry_implementation_advice = industry_answers
+
+        self.add_to_history("博士生", literature_question)
+        self.add_to_history("高校导师", academic_literature_advice)
+        self.add_to_history("博士生", application_question)
+        self.add_to_history("企业导师", industry_application_advice)
+        self.add_to_history("博士生", method_question)
+        self.add_to_history("高校导师", academic_method_advice)
+        self.add_to_history("博士生", implementation_question)
         self.add_to_history("企业导师", industry_implementation_advice)
 
         # 博士生汇报研究进展
@@ -308,8 +594,11 @@ class AgentCoordinator:
         请基于之前的交流内容来撰写这份报告。
         """
 
-        progress_report = self.phd_student.get_response(progress_report_prompt)
-        self.add_to_history("博士生", f"研究进展报告：\n\n{progress_report}")
+        progress_report = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(progress_report_prompt),
+            prefix="研究进展报告：\n\n"
+        )
 
         # 阶段总结 - 为每个代理创建阶段记忆
         phase_context = f"""
@@ -323,17 +612,7 @@ class AgentCoordinator:
         self.academic_advisor.inject_memories_to_context(["initialization"])
         self.industry_advisor.inject_memories_to_context(["initialization"])
 
-        # 博士生总结
-        phd_summary = self.phd_student.summarize_phase("research_execution", phase_context)
-        self.add_to_history("系统", f"[博士生阶段总结] {phd_summary}")
-
-        # 高校导师总结
-        academic_summary = self.academic_advisor.summarize_phase("research_execution", phase_context)
-        self.add_to_history("系统", f"[高校导师阶段总结] {academic_summary}")
-
-        # 企业导师总结
-        industry_summary = self.industry_advisor.summarize_phase("research_execution", phase_context)
-        self.add_to_history("系统", f"[企业导师阶段总结] {industry_summary}")
+        self._summarize_phase_concurrently("research_execution", phase_context)
 
         print("\n----- 研究执行阶段完成 -----\n")
 
@@ -348,29 +627,32 @@ class AgentCoordinator:
             "academic",
             "我准备开始撰写论文，请您指导：1）对于我们的研究方向，应采用什么样的理论框架最能体现学术贡献？2）论文应如何组织结构才能严谨地展示研究成果？3）有哪些顶级期刊的论文结构和理论框架值得我参考？"
         )
-        self.add_to_history("博士生", structure_question)
-
-        academic_structure_advice = self.academic_advisor.answer_question(structure_question)
-        self.add_to_history("高校导师", academic_structure_advice)
 
         # 博士生请教实验设计和评估方法
         experiment_question = self.phd_student.ask_question(
             "industry",
             "对于我们的研究，我需要设计严谨的实验来验证方法的有效性。请您指导：1）应该设计哪些对照实验和消融实验？2）如何确保实验的统计显著性和可复现性？3）在抖音这样的实际场景中，如何设计全面的评估指标体系？4）如何有效展示实验结果以支持我们的理论主张？"
         )
-        self.add_to_history("博士生", experiment_question)
-
-        industry_experiment_advice = self.industry_advisor.answer_question(experiment_question)
-        self.add_to_history("企业导师", industry_experiment_advice)
 
         # 博士生请教文献综述方法
         literature_question = self.phd_student.ask_question(
             "academic",
             "为了确保我的相关工作部分全面且深入，请您指导：1）我应该如何系统地组织和分析现有文献？2）如何有效地识别和突出现有方法的局限性？3）如何将我的工作与现有研究明确区分？4）有哪些最新的研究趋势和方法是我必须涵盖的？"
         )
-        self.add_to_history("博士生", literature_question)
 
-        academic_literature_advice = self.academic_advisor.answer_question(literature_question)
+        # 每个问题都要求详细回答，分别请求而不合并，以免回复被截断；高校导师依次回答结构和文献两个问题，
+        # 与企业导师回答实验问题并发进行
+        academic_answers, industry_experiment_advice = self._run_concurrently(
+            _aanswer_in_order(self.academic_advisor, [structure_question, literature_question]),
+            self.industry_advisor.aanswer_question(experiment_question)
+        )
+        academic_structure_advice, academic_literature_advice = academic_answers
+
+        self.add_to_history("博士生", structure_question)
+        self.add_to_history("高校导师", academic_structure_advice)
+        self.add_to_history("博士生", experiment_question)
+        self.add_to_history("企业导师", industry_experiment_advice)
+        self.add_to_history("博士生", literature_question)
         self.add_to_history("高校导师", academic_literature_advice)
 
         # 博士生撰写论文初稿（摘要和引言）
@@ -414,23 +696,24 @@ class AgentCoordinator:
         - 逻辑结构严密，论证过程完整
         """
 
-        initial_draft = self.phd_student.get_response(paper_draft_prompt)
-        self.add_to_history("博士生", f"我的论文初稿（摘要和引言部分）：\n\n{initial_draft}")
+        # 只有撰写论文内容的请求附带论文篇幅和参考文献要求，提问、修改方案和总结类请求不附带
+        with self.phd_student.paper_mode_enabled():
+            initial_draft = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(paper_draft_prompt),
+                prefix="我的论文初稿（摘要和引言部分）：\n\n"
+            )
 
         # 保存初稿
         self.phd_student.update_paper_draft(initial_draft)
-        self.paper_drafts.append({
-            "version": 1,
-            "content": initial_draft,
-            "phase": self.current_phase
-        })
+        self._add_paper_draft(1, initial_draft)
 
-        # 高校导师评价初稿
-        academic_draft_review = self.academic_advisor.review_paper_draft(initial_draft)
+        # 高校导师和企业导师并发评价初稿
+        academic_draft_review, industry_draft_review = self._run_concurrently(
+            self.academic_advisor.areview_paper_draft(initial_draft),
+            self.industry_advisor.areview_paper_draft(initial_draft)
+        )
         self.add_to_history("高校导师", academic_draft_review)
-
-        # 企业导师评价初稿
-        industry_draft_review = self.industry_advisor.review_paper_draft(initial_draft)
         self.add_to_history("企业导师", industry_draft_review)
 
         # 博士生撰写相关工作部分
@@ -481,8 +764,12 @@ class AgentCoordinator:
         - 为本文的工程创新点和业务价值奠定基础
         """
 
-        related_work_section = self.phd_student.get_response(related_work_prompt)
-        self.add_to_history("博士生", f"我撰写的相关工作部分：\n\n{related_work_section}")
+        with self.phd_student.paper_mode_enabled():
+            related_work_section = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(related_work_prompt),
+                prefix="我撰写的相关工作部分：\n\n"
+            )
 
         # 博士生撰写方法论部分
         methodology_prompt = f"""
@@ -547,8 +834,12 @@ class AgentCoordinator:
         - 讨论实际部署中可能面临的挑战和解决方案
         """
 
-        methodology_section = self.phd_student.get_response(methodology_prompt)
-        self.add_to_history("博士生", f"我撰写的方法论部分：\n\n{methodology_section}")
+        with self.phd_student.paper_mode_enabled():
+            methodology_section = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(methodology_prompt),
+                prefix="我撰写的方法论部分：\n\n"
+            )
 
         # 博士生撰写实验部分
         experiment_prompt = f"""
@@ -640,8 +931,12 @@ class AgentCoordinator:
         - 强调系统的实际业务价值和部署经验
         """
 
-        experiment_section = self.phd_student.get_response(experiment_prompt)
-        self.add_to_history("博士生", f"我撰写的实验部分：\n\n{experiment_section}")
+        with self.phd_student.paper_mode_enabled():
+            experiment_section = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(experiment_prompt),
+                prefix="我撰写的实验部分：\n\n"
+            )
 
         # 博士生撰写结论部分
         conclusion_prompt = f"""
@@ -688,8 +983,12 @@ class AgentCoordinator:
         - 语言既有学术严谨性，又具备工程实用性和业务洞察
         """
 
-        conclusion_section = self.phd_student.get_response(conclusion_prompt)
-        self.add_to_history("博士生", f"我撰写的结论部分：\n\n{conclusion_section}")
+        with self.phd_student.paper_mode_enabled():
+            conclusion_section = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(conclusion_prompt),
+                prefix="我撰写的结论部分：\n\n"
+            )
 
         # 整合完整论文
         complete_draft_prompt = f"""
@@ -725,16 +1024,16 @@ class AgentCoordinator:
         最终论文应当是一个完整、严谨、深入的学术作品，同时具有明确的工程实用价值和产业应用前景，能够在数据挖掘和信息检索领域的顶级会议（如KDD、WWW、SIGIR等）发表，并对互联网企业的实际业务有参考价值。
         """
 
-        complete_draft = self.phd_student.get_response(complete_draft_prompt)
-        self.add_to_history("博士生", f"我完善后的完整论文草稿：\n\n{complete_draft}")
+        with self.phd_student.paper_mode_enabled():
+            complete_draft = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(complete_draft_prompt),
+                prefix="我完善后的完整论文草稿：\n\n"
+            )
 
         # 更新论文草稿
         self.phd_student.update_paper_draft(complete_draft)
-        self.paper_drafts.append({
-            "version": 2,
-            "content": complete_draft,
-            "phase": self.current_phase
-        })
+        self._add_paper_draft(2, complete_draft)
 
         # 阶段总结 - 为每个代理创建阶段记忆
         phase_context = f"""
@@ -748,17 +1047,7 @@ class AgentCoordinator:
         self.academic_advisor.inject_memories_to_context(["initialization", "research_execution"])
         self.industry_advisor.inject_memories_to_context(["initialization", "research_execution"])
 
-        # 博士生总结
-        phd_summary = self.phd_student.summarize_phase("paper_writing", phase_context)
-        self.add_to_history("系统", f"[博士生阶段总结] {phd_summary}")
-
-        # 高校导师总结
-        academic_summary = self.academic_advisor.summarize_phase("paper_writing", phase_context)
-        self.add_to_history("系统", f"[高校导师阶段总结] {academic_summary}")
-
-        # 企业导师总结
-        industry_summary = self.industry_advisor.summarize_phase("paper_writing", phase_context)
-        self.add_to_history("系统", f"[企业导师阶段总结] {industry_summary}")
+        self._summarize_phase_concurrently("paper_writing", phase_context)
 
         print("\n----- 论文撰写阶段完成 -----\n")
 
@@ -771,15 +1060,7 @@ class AgentCoordinator:
         # 获取当前论文草稿
         current_draft = self.phd_student.paper_draft
 
-        # 使用论文评估模块进行全面评估
-        evaluation_result = self.evaluation_module.evaluate_paper(current_draft)
-        self.add_to_history("论文评估模块", f"论文评估结果：\n\n{evaluation_result}")
-
-        # 生成详细改进计划
-        improvement_plan = self.evaluation_module.generate_improvement_plan(current_draft, evaluation_result)
-        self.add_to_history("论文评估模块", f"论文改进计划：\n\n{improvement_plan}")
-
-        # 博士生咨询高校导师关于理论创新和学术贡献
+        # 博士生准备咨询高校导师关于理论创新和学术贡献
         theory_question = self.phd_student.ask_question(
             "academic",
             f"""根据评估结果，我需要深化论文的理论贡献。请您从以下几个方面给予具体指导：
@@ -791,12 +1072,8 @@ class AgentCoordinator:
             5. 如何在保持理论严谨性的同时，使论文更具可读性？
             """
         )
-        self.add_to_history("博士生", theory_question)
-
-        academic_theory_advice = self.academic_advisor.answer_question(theory_question)
-        self.add_to_history("高校导师", academic_theory_advice)
 
-        # 博士生咨询企业导师关于实验设计和实用价值
+        # 博士生准备咨询企业导师关于实验设计和实用价值
         application_value_question = self.phd_student.ask_question(
             "industry",
             f"""根据评估结果，我需要增强论文的实验验证和实用价值。请您从以下几个方面给予具体指导：
@@ -808,12 +1085,8 @@ class AgentCoordinator:
             5. 如何量化评估我的方法带来的业务提升？需要哪些具体的指标？
             """
         )
-        self.add_to_history("博士生", application_value_question)
-
-        industry_value_advice = self.industry_advisor.answer_question(application_value_question)
-        self.add_to_history("企业导师", industry_value_advice)
 
-        # 博士生咨询高校导师关于论文结构和表达
+        # 博士生准备咨询高校导师关于论文结构和表达
         writing_question = self.phd_student.ask_question(
             "academic",
             f"""为了提升论文的整体质量，我需要优化论文的结构和表达。请您从以下几个方面给予具体指导：
@@ -825,12 +1098,8 @@ class AgentCoordinator:
             5. 在学术表达上有哪些常见问题需要避免？
             """
         )
-        self.add_to_history("博士生", writing_question)
-
-        academic_writing_advice = self.academic_advisor.answer_question(writing_question)
-        self.add_to_history("高校导师", academic_writing_advice)
 
-        # 博士生咨询企业导师关于潜在的应用场景扩展
+        # 博士生准备咨询企业导师关于潜在的应用场景扩展
         application_extension_question = self.phd_student.ask_question(
             "industry",
             f"""为了增强论文的影响力，我想探讨方法的应用场景扩展。请您从以下几个方面给予具体指导：
@@ -842,9 +1111,26 @@ class AgentCoordinator:
             5. 如何在论文中展示方法的长期价值和未来发展潜力？
             """
         )
-        self.add_to_history("博士生", application_extension_question)
 
-        industry_extension_advice = self.industry_advisor.answer_question(application_extension_question)
+        # 论文评估（评估后再生成改进计划）与两位导师的咨询互不依赖，三者并发执行；
+        # 每位导师按顺序逐个回答自己的两个问题，每个问题都要求详细回答，分别请求而不合并，避免单次回复过长被截断
+        (evaluation_result, improvement_plan), academic_answers, industry_answers = self._run_concurrently(
+            asyncio.to_thread(self._evaluate_with_improvement_plan, current_draft),
+            _aanswer_in_order(self.academic_advisor, [theory_question, writing_question]),
+            _aanswer_in_order(self.industry_advisor, [application_value_question, application_extension_question])
+        )
+        academic_theory_advice, academic_writing_advice = academic_answers
+        industry_value_advice, industry_extension_advice = industry_answers
+
+        self.add_to_history("论文评估模块", evaluation_result, prefix="论文评估结果：\n\n")
+        self.add_to_history("论文评估模块", improvement_plan, prefix="论文改进计划：\n\n")
+        self.add_to_history("博士生", theory_question)
+        self.add_to_history("高校导师", academic_theory_advice)
+        self.add_to_history("博士生", application_value_question)
+        self.add_to_history("企业导师", industry_value_advice)
+        self.add_to_history("博士生", writing_question)
+        self.add_to_history("高校导师", academic_writing_advice)
+        self.add_to_history("博士生", application_extension_question)
         self.add_to_history("企业导师", industry_extension_advice)
 
         # 博士生优化理论部分
@@ -883,8 +1169,12 @@ class AgentCoordinator:
         请确保理论部分既有学术深度又有工程实用性，使用精确的数学语言描述核心理论，同时提供必要的工程解释和实现指导。理论分析应当既能满足学术严谨性要求，又能为工程师提供实用的系统设计和实现指导。
         """
 
-        theory_optimization = self.phd_student.get_response(theory_optimization_prompt)
-        self.add_to_history("博士生", f"我优化后的理论部分：\n\n{theory_optimization}")
+        with self.phd_student.paper_mode_enabled():
+            theory_optimization = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(theory_optimization_prompt),
+                prefix="我优化后的理论部分：\n\n"
+            )
 
         # 博士生优化实验部分
         experiment_optimization_prompt = f"""
@@ -932,8 +1222,12 @@ class AgentCoordinator:
         请确保实验部分既有科学严谨性，又有明确的业务价值和工程实用性。使用丰富的图表和表格来呈现结果，包括业务指标仪表盘、性能监控图表、资源利用率分析等。提供深入的分析和讨论，特别关注系统如何解决实际互联网内容挖掘中的关键业务挑战。
         """
 
-        experiment_optimization = self.phd_student.get_response(experiment_optimization_prompt)
-        self.add_to_history("博士生", f"我优化后的实验部分：\n\n{experiment_optimization}")
+        with self.phd_student.paper_mode_enabled():
+            experiment_optimization = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(experiment_optimization_prompt),
+                prefix="我优化后的实验部分：\n\n"
+            )
 
         # 博士生优化论文结构和表达
         writing_optimization_prompt = f"""
@@ -961,8 +1255,11 @@ class AgentCoordinator:
         请提供优化建议和具体的修改方案，而不是重写整篇论文。
         """
 
-        writing_optimization = self.phd_student.get_response(writing_optimization_prompt)
-        self.add_to_history("博士生", f"我的论文结构和表达优化方案：\n\n{writing_optimization}")
+        writing_optimization = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(writing_optimization_prompt),
+            prefix="我的论文结构和表达优化方案：\n\n"
+        )
 
         # 博士生扩展应用场景
         application_extension_prompt = f"""
@@ -1009,8 +1306,12 @@ class AgentCoordinator:
         请确保这部分内容既有技术深度，又有明确的业务场景和商业价值分析。每个应用场景应当包含具体的技术实现方案、业务指标预期和实施建议，而不是泛泛而谈。特别强调系统如何解决互联网内容挖掘中的实际痛点问题，以及如何为内容平台创造可量化的商业价值。
         """
 
-        application_extension = self.phd_student.get_response(application_extension_prompt)
-        self.add_to_history("博士生", f"我撰写的应用扩展部分：\n\n{application_extension}")
+        with self.phd_student.paper_mode_enabled():
+            application_extension = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(application_extension_prompt),
+                prefix="我撰写的应用扩展部分：\n\n"
+            )
 
         # 整合优化后的论文
         integrate_optimization_prompt = f"""
@@ -1042,23 +1343,23 @@ class AgentCoordinator:
         最终论文应当是一个完整、严谨、深入的学术作品，既有扎实的理论基础，又有充分的实验验证，同时展示出广泛的应用价值。
         """
 
-        optimized_draft = self.phd_student.get_response(integrate_optimization_prompt)
-        self.add_to_history("博士生", f"我优化后的完整论文：\n\n{optimized_draft}")
+        with self.phd_student.paper_mode_enabled():
+            optimized_draft = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(integrate_optimization_prompt),
+                prefix="我优化后的完整论文：\n\n"
+            )
 
         # 更新论文草稿
         self.phd_student.update_paper_draft(optimized_draft)
-        self.paper_drafts.append({
-            "version": 3,
-            "content": optimized_draft,
-            "phase": self.current_phase
-        })
+        self._add_paper_draft(3, optimized_draft)
 
-        # 高校导师最终评审
-        final_academic_review = self.academic_advisor.review_paper_draft(optimized_draft)
+        # 高校导师和企业导师并发进行最终评审
+        final_academic_review, final_industry_review = self._run_concurrently(
+            self.academic_advisor.areview_paper_draft(optimized_draft),
+            self.industry_advisor.areview_paper_draft(optimized_draft)
+        )
         self.add_to_history("高校导师", final_academic_review)
-
-        # 企业导师最终评审
-        final_industry_review = self.industry_advisor.review_paper_draft(optimized_draft)
         self.add_to_history("企业导师", final_industry_review)
 
         # 博士生进行最后修改
@@ -1108,16 +1409,16 @@ class AgentCoordinator:
         请提供最终修改版本，确保其既达到数据挖掘和信息检索领域顶级会议（如KDD、WWW、SIGIR等）的学术标准，又具有明确的工程实用价值和产业应用指导意义，能够为互联网内容平台的技术团队提供实际参考。
         """
 
-        final_revision = self.phd_student.get_response(final_revision_prompt)
-        self.add_to_history("博士生", f"我的论文最终修改版：\n\n{final_revision}")
+        with self.phd_student.paper_mode_enabled():
+            final_revision = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(final_revision_prompt),
+                prefix="我的论文最终修改版：\n\n"
+            )
 
         # 更新最终论文
         self.phd_student.update_paper_draft(final_revision)
-        self.paper_drafts.append({
-            "version": 4,
-            "content": final_revision,
-            "phase": self.current_phase
-        })
+        self._add_paper_draft(4, final_revision)
 
         # 阶段总结 - 为每个代理创建阶段记忆
         phase_context = f"""
@@ -1131,19 +1432,22 @@ class AgentCoordinator:
         self.academic_advisor.inject_memories_to_context(["initialization", "research_execution", "paper_writing"])
         self.industry_advisor.inject_memories_to_context(["initialization", "research_execution", "paper_writing"])
 
-        # 博士生总结
-        phd_summary = self.phd_student.summarize_phase("paper_optimization", phase_context)
-        self.add_to_history("系统", f"[博士生阶段总结] {phd_summary}")
+        self._summarize_phase_concurrently("paper_optimization", phase_context)
+
+        print("\n----- 论文优化阶段完成 -----\n")
 
-        # 高校导师总结
-        academic_summary = self.academic_advisor.summarize_phase("paper_optimization", phase_context)
-        self.add_to_history("系统", f"[高校导师阶段总结] {academic_summary}")
+    def _evaluate_with_improvement_plan(self, paper: str) -> Tuple[str, str]:
+        """
+        评估论文并基于评估结果生成改进计划
 
-        # 企业导师总结
-        industry_summary = self.industry_advisor.summarize_phase("paper_optimization", phase_context)
-        self.add_to_history("系统", f"[企业导师阶段总结] {industry_summary}")
+        Args:
+            paper: 论文内容
 
-        print("\n----- 论文优化阶段完成 -----\n")
+        Returns:
+            (评估结果, 改进计划)
+        """
+        evaluation_result = self.evaluation_module.evaluate_paper(paper)
+        return evaluation_result, self.evaluation_module.generate_improvement_plan(paper, evaluation_result)
 
     def _paper_finalization_phase(self) -> None:
         """
@@ -1164,22 +1468,13 @@ class AgentCoordinator:
         academic_venue_advice = self.academic_advisor.answer_question(venue_question)
         self.add_to_history("高校导师", academic_venue_advice)
 
-        # 确定目标会议
-        target_venue_prompt = f"""
-        基于高校导师的建议：{academic_venue_advice}
-
-        请选择一个最适合你论文的目标会议或期刊，并说明选择理由。
-        """
-
-        target_venue_decision = self.phd_student.get_response(target_venue_prompt)
-        self.add_to_history("博士生", target_venue_decision)
-
-        # 提取目标会议名称（简化处理）
-        target_venue = target_venue_decision.split("\n")[0] if "\n" in target_venue_decision else target_venue_decision
+        # 确定目标会议：直接取导师建议中最先推荐的会议或期刊，无需再请求模型
+        target_venue = _extract_first_venue(academic_venue_advice)
+        self.add_to_history("博士生", f"根据高校导师的建议，我选择{target_venue}作为目标会议/期刊。")
 
         # 检查论文是否达到发表标准
         readiness_check = self.evaluation_module.check_publication_readiness(final_paper, target_venue)
-        self.add_to_history("论文评估模块", f"发表就绪性检查结果：\n\n{readiness_check}")
+        self.add_to_history("论文评估模块", readiness_check, prefix="发表就绪性检查结果：\n\n")
 
         # 博士生进行最终完善
         finalization_prompt = f"""
@@ -1190,27 +1485,27 @@ class AgentCoordinator:
         此外，请调整论文格式以符合{target_venue}的投稿要求。
         """
 
-        final_paper_version = self.phd_student.get_response(finalization_prompt)
-        self.add_to_history("博士生", f"论文最终版本：\n\n{final_paper_version}")
+        with self.phd_student.paper_mode_enabled():
+            final_paper_version = self.add_streamed_to_history(
+                "博士生",
+                self.phd_student.stream_response(finalization_prompt),
+                prefix="论文最终版本：\n\n"
+            )
 
         # 更新最终论文
         self.phd_student.update_paper_draft(final_paper_version)
-        self.paper_drafts.append({
-            "version": 5,
-            "content": final_paper_version,
-            "phase": self.current_phase
-        })
-
-        # 高校导师最终确认
-        final_academic_confirmation = self.academic_advisor.get_response(
-            f"请对博士生的最终论文版本进行确认，评估其是否达到{target_venue}的发表标准，并给出最后的建议。\n\n{final_paper_version}"
+        self._add_paper_draft(5, final_paper_version)
+
+        # 高校导师和企业导师并发进行最终确认
+        final_academic_confirmation, final_industry_confirmation = self._run_concurrently(
+            self.academic_advisor.aget_response(
+                f"请对博士生的最终论文版本进行确认，评估其是否达到{target_venue}的发表标准，并给出最后的建议。\n\n{final_paper_version}"
+            ),
+            self.industry_advisor.aget_response(
+                f"请从产业应用角度，对博士生的最终论文版本进行确认，评估其实用价值和影响力，并给出最后的建议。\n\n{final_paper_version}"
+            )
         )
         self.add_to_history("高校导师", final_academic_confirmation)
-
-        # 企业导师最终确认
-        final_industry_confirmation = self.industry_advisor.get_response(
-            f"请从产业应用角度，对博士生的最终论文版本进行确认，评估其实用价值和影响力，并给出最后的建议。\n\n{final_paper_version}"
-        )
         self.add_to_history("企业导师", final_industry_confirmation)
 
         # 系统总结
@@ -1245,17 +1540,7 @@ class AgentCoordinator:
         self.academic_advisor.inject_memories_to_context(["initialization", "research_execution", "paper_writing", "paper_optimization"])
         self.industry_advisor.inject_memories_to_context(["initialization", "research_execution", "paper_writing", "paper_optimization"])
 
-        # 博士生总结
-        phd_summary = self.phd_student.summarize_phase("paper_finalization", phase_context)
-        self.add_to_history("系统", f"[博士生阶段总结] {phd_summary}")
-
-        # 高校导师总结
-        academic_summary = self.academic_advisor.summarize_phase("paper_finalization", phase_context)
-        self.add_to_history("系统", f"[高校导师阶段总结] {academic_summary}")
-
-        # 企业导师总结
-        industry_summary = self.industry_advisor.summarize_phase("paper_finalization", phase_context)
-        self.add_to_history("系统", f"[企业导师阶段总结] {industry_summary}")
+        self._summarize_phase_concurrently("paper_finalization", phase_context)
 
         # 整个项目的最终总结
         final_project_summary_prompt = f"""
@@ -1272,23 +1557,31 @@ class AgentCoordinator:
         """
 
         # 博士生提供最终项目总结
-        final_project_summary = self.phd_student.get_response(final_project_summary_prompt)
-        self.add_to_history("博士生", f"项目最终总结：\n\n{final_project_summary}")
+        final_project_summary = self.add_streamed_to_history(
+            "博士生",
+            self.phd_student.stream_response(final_project_summary_prompt),
+            prefix="项目最终总结：\n\n"
+        )
 
         # 将最终总结也存储为记忆
         self.phd_student.create_memory("project_summary", final_project_summary)
 
         print("\n----- 论文定稿发表阶段完成 -----\n")
 
-    def save_interaction_history(self, filename: str = "interaction_history.json") -> None:
+    def save_interaction_history(self, filename: str = "interaction_history.json", pretty: bool = False) -> None:
         """
         保存交互历史到文件
 
         Args:
             filename: 输出文件名
+            pretty: 是否以缩进格式完整展开每条记录（便于人工阅读，但编码较慢、文件较大）；
+                默认每条记录紧凑地占一行
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(self.interaction_history, f, ensure_ascii=False, indent=2)
+        if pretty:
+            with open(filename, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+                json.dump(self.interaction_history, f, ensure_ascii=False, indent=2)
+        else:
+            _dump_json_list(self.interaction_history, filename)
 
         print(f"交互历史已保存到 {filename}")
 
@@ -1299,8 +1592,13 @@ class AgentCoordinator:
         Args:
             filename: 输出文件名
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(self.paper_drafts, f, ensure_ascii=False, indent=2)
+        _dump_json_list(
+            [
+                {"version": draft["version"], "content": self.get_draft(draft["version"]), "phase": draft["phase"]}
+                for draft in self.paper_drafts
+            ],
+            filename
+        )
 
         print(f"论文草稿历史已保存到 {filename}")
 
@@ -1311,6 +1609,9 @@ class AgentCoordinator:
         Args:
             directory: 输出目录
         """
+        # 先等待后台压缩完成，避免保存时仍有进行中的任务
+        self._flush_background_work()
+
         # 创建目录（如果不存在）
         if not os.path.exists(directory):
             os.makedirs(directory)
@@ -1318,16 +1619,16 @@ class AgentCoordinator:
         # 保存博士生记忆
         phd_memories_path = os.path.join(directory, "phd_student_memories.json")
         with open(phd_memories_path, "w", encoding="utf-8") as f:
-            json.dump(self.phd_student.memory_bank, f, ensure_ascii=False, indent=2)
+            json.dump(self.phd_student.export_memories(), f, ensure_ascii=False, indent=2)
 
         # 保存高校导师记忆
         academic_memories_path = os.path.join(directory, "academic_advisor_memories.json")
         with open(academic_memories_path, "w", encoding="utf-8") as f:
-            json.dump(self.academic_advisor.memory_bank, f, ensure_ascii=False, indent=2)
+            json.dump(self.academic_advisor.export_memories(), f, ensure_ascii=False, indent=2)
 
         # 保存企业导师记忆
         industry_memories_path = os.path.join(directory, "industry_advisor_memories.json")
         with open(industry_memories_path, "w", encoding="utf-8") as f:
-            json.dump(self.industry_advisor.memory_bank, f, ensure_ascii=False, indent=2)
+            json.dump(self.industry_advisor.export_memories(), f, ensure_ascii=False, indent=2)
 
         print(f"代理记忆已保存到 {directory} 目录")
\ No newline at end of file
@@ -28,15 +28,16 @@ def main():
         evaluation_module=evaluation_module
     )
 
-    # 运行系统
-    coordinator.start_interaction()
-
-    # 保存交互历史和论文草稿
-    coordinator.save_interaction_history("interaction_history.json")
-    coordinator.save_paper_drafts("paper_drafts.json")
-
-    # 保存代理记忆
-    coordinator.save_agent_memories("memories")
+    # 运行系统；API调用在重试后仍失败时会抛出异常，此时也先保存已有的交互历史、草稿和记忆
+    try:
+        coordinator.start_interaction()
+    finally:
+        # 保存交互历史和论文草稿
+        coordinator.save_interaction_history("interaction_history.json")
+        coordinator.save_paper_drafts("paper_drafts.json")
+
+        # 保存代理记忆
+        coordinator.save_agent_memories("memories")
 
     # 保存最终论文
     save_final_paper(coordinator.phd_student.paper_draft)
@@ -1,5 +1,5 @@
+from agents.base_agent import get_shared_client
 from openai import OpenAI
-import os
 from typing import List, Dict, Any, Optional
 
 class KnowledgeRetrievalModule:
@@ -14,10 +14,18 @@ class KnowledgeRetrievalModule:
             model: 使用的大模型名称
         """
         self.model = model
-        self.client = OpenAI(
-            api_key=os.environ.get("DEEPSEEK_API_KEY"),
-            base_url="https://api.deepseek.com"
-        )
+        self._client: Optional[OpenAI] = None  # 首次请求时才获取共享客户端
+
+    @property
+    def client(self) -> OpenAI:
+        """同步客户端，首次访问时获取与各Agent共享的客户端和连接池"""
+        if self._client is None:
+            self._client = get_shared_client()
+        return self._client
+
+    @client.setter
+    def client(self, value: OpenAI) -> None:
+        self._client = value
 
     def search_papers(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
         """